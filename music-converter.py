@@ -11,11 +11,10 @@ Usage:
 import click
 import sys
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import threading
+import asyncio
 import os
 
-from src.converter import MusicConverter
+from src.converter import MusicConverter, ConversionResult, Action
 from src.metadata import MetadataHandler
 from src.ui import MusicConverterUI
 from src.reporter import ReportGenerator
@@ -108,72 +107,109 @@ def main(source: str, target: str, force: bool, codec: str, bitrate: int, thread
             num_threads = ui.get_thread_count()
             ui.show_info(f"Using {num_threads} thread(s) for processing")
 
-        # Thread-safe lock for progress updates
-        progress_lock = threading.Lock()
-        completed_count = 0
-        total_files = len(audio_files)
+        # Split the cores between workers so workers x ffmpeg threads ~= cpu count
+        converter.ffmpeg_threads = max(1, (os.cpu_count() or 1) // num_threads)
 
-        # Process files concurrently with progress bar
+        # Files whose target is already up to date are never scheduled
         results = []
-        with ui.create_progress_bar(total_files) as (progress, task):
-            with ThreadPoolExecutor(max_workers=num_threads) as executor:
-                # Submit all jobs
-                future_to_file = {
-                    executor.submit(converter.process_file, fp, target_codec, target_bitrate): fp
-                    for fp in audio_files
-                }
-
-                # Collect results as they complete
-                for future in as_completed(future_to_file):
-                    file_path = future_to_file[future]
-
-                    try:
-                        result = future.result()
-
-                        # Apply metadata AFTER conversion (sequential, thread-safe)
-                        if result.action == 'converted' and not dry_run:
-                            metadata_success = metadata_handler.apply_metadata(
-                                result.source_path, result.target_path
-                            )
-                            if not metadata_success:
-                                ui.show_warning(f"Could not apply metadata to {file_path.name}")
-
-                        results.append(result)
-
-                        # Show status for the file
-                        if result.action == 'converted':
-                            ui.show_file_status(
-                                result.source_path.name, "converted",
-                                result.source_size, result.target_size
-                            )
-                        elif result.action == 'copied':
-                            ui.show_file_status(result.source_path.name, "copied")
-                        elif result.action == 'error':
-                            ui.show_file_status(result.source_path.name, "error")
-
-                    except Exception as e:
-                        ui.show_error(f"Error processing {file_path.name}: {e}")
-                        # Create error result
-                        from src.converter import ConversionResult
-                        error_result = ConversionResult(
-                            source_path=file_path,
-                            target_path=file_path,
-                            action='error',
-                            source_size=converter.get_file_size(file_path),
-                            target_size=0,
-                            source_format={},
-                            error_message=str(e)
-                        )
-                        results.append(error_result)
-                        ui.show_file_status(file_path.name, "error")
-
-                    # Thread-safe progress update
-                    with progress_lock:
-                        completed_count += 1
-                        progress.update(
-                            task, advance=1,
-                            description=f"Processing ({completed_count}/{total_files})"
-                        )
+        pending_files = []
+        for fp in audio_files:
+            if converter.target_is_current(fp, target_codec, target_bitrate):
+                results.append(converter.make_skipped_result(fp, target_codec))
+            else:
+                pending_files.append(fp)
+
+        if results:
+            ui.show_info(f"Skipping {len(results)} file(s) already up to date")
+
+        total_files = len(pending_files)
+
+        # Output directories are created once here instead of per file
+        converter.create_output_directories(pending_files)
+
+        # Probe the files whose action can't be decided from the extension
+        to_probe = [
+            fp for fp in pending_files
+            if converter.quick_needs_conversion(fp, target_codec, target_bitrate) is None
+        ]
+        with ui.create_loading_spinner("Reading audio info..."):
+            converter.prefetch_audio_info(to_probe)
+
+        # Start the largest files first so a long FLAC doesn't start last and
+        # dominate the tail of the run
+        pending_files.sort(key=converter.get_file_size, reverse=True)
+
+        def handle_result(result: ConversionResult):
+            results.append(result)
+
+            # Show status for the file
+            ui.show_file_status(
+                result.source_path.name, result.action.label,
+                result.source_size, result.target_size
+            )
+
+        async def process_one(file_path: Path, semaphore: asyncio.Semaphore, completed):
+            async with semaphore:
+                try:
+                    result = await converter.process_file_async(file_path, target_codec, target_bitrate)
+                except Exception as e:
+                    # Create error result; reported once the progress bar closes
+                    result = ConversionResult(
+                        source_path=file_path,
+                        target_path=file_path,
+                        action=Action.ERROR,
+                        source_size=converter.get_file_size(file_path),
+                        target_size=0,
+                        source_format={},
+                        error_message=str(e)
+                    )
+            handle_result(result)
+            completed.increment()
+
+        async def process_all(completed):
+            # One event loop drives every ffprobe/ffmpeg subprocess; the semaphore
+            # caps how many run at once
+            semaphore = asyncio.Semaphore(num_threads)
+            await asyncio.gather(*(process_one(fp, semaphore, completed) for fp in pending_files))
+
+        # Process files concurrently with progress bar, redrawn at most 10 times a second
+        # on a terminal and once a second when output is redirected
+        with ui.create_progress_bar(total_files) as (progress, task), \
+                ui.coalesced_progress(progress, task, total_files) as completed:
+            asyncio.run(process_all(completed))
+
+        # Apply metadata AFTER conversion, reading all converted sources in one batch
+        if not dry_run:
+            converted_results = [r for r in results if r.action == Action.CONVERTED]
+            with ui.create_loading_spinner("Applying metadata..."):
+                source_metadata = metadata_handler.extract_many([r.source_path for r in converted_results])
+                metadata_failures = [
+                    r for r, metadata in zip(converted_results, source_metadata)
+                    if not metadata_handler.apply_cached_metadata(r.target_path, metadata)
+                ]
+            for result in metadata_failures:
+                ui.show_warning(f"Could not apply metadata to {result.source_path.name}")
+
+            # Targets count as up to date only once tagged, so untagged ones are redone next run
+            untagged = {r.source_path for r in metadata_failures}
+            for result in results:
+                if result.action == Action.COPIED or (
+                        result.action == Action.CONVERTED and result.source_path not in untagged):
+                    converter.record_target(result.source_path, target_codec, target_bitrate)
+
+        # Restore directory order for the error list and report
+        results.sort(key=lambda r: r.source_path)
+
+        # Report errors after the progress bar so worker output can't garble it
+        for result in results:
+            if result.error_message:
+                ui.show_error(f"{result.source_path.name}: {result.error_message}")
+
+        # Deleted or renamed sources would otherwise stay in the cache forever
+        converter.prune_probe_cache(audio_files)
+        cache_error = converter.save_probe_cache()
+        if cache_error:
+            ui.show_warning(f"Could not save ffprobe cache: {cache_error}")
 
         # Calculate and show statistics
         if results:
@@ -186,6 +222,7 @@ def main(source: str, target: str, force: bool, codec: str, bitrate: int, thread
                 'converted': 0,
                 'copied': 0,
                 'errors': 0,
+                'skipped': 0,
                 'total_source_size': 0,
                 'total_target_size': 0,
                 'space_saved': 0,
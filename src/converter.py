@@ -4,11 +4,61 @@ Core conversion logic for the music converter.
 Handles file scanning, conversion decision making, and ffmpeg execution.
 """
 
+import asyncio
 import subprocess
 import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
+from enum import IntEnum
+
+try:
+    # orjson parses ffprobe's bytes output directly and is considerably faster
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+try:
+    # PyAV reads stream info in-process, avoiding an ffprobe spawn per file
+    import av
+except ImportError:
+    av = None
+
+
+# ffmpeg encoder arguments per target codec, given the bitrate in kbps
+_CODEC_ARGS = {
+    'mp3': lambda bitrate: ['-c:a', 'libmp3lame', '-b:a', f'{bitrate}k'],
+    'aac': lambda bitrate: ['-c:a', 'aac', '-b:a', f'{bitrate}k'],
+    'flac': lambda bitrate: ['-c:a', 'flac', '-compression_level', '8'],
+    'opus': lambda bitrate: ['-c:a', 'libopus', '-b:a', f'{bitrate}k'],
+}
+
+# Target codecs whose container carries cover art; the Ogg muxer used for
+# Opus can't take a picture stream
+_COVER_ART_CODECS = frozenset({'mp3', 'aac', 'flac'})
+
+# Lossy codecs considered by needs_conversion's similar-bitrate check
+_LOSSY_SOURCE_CODECS = frozenset({'mp3', 'aac', 'wma', 'ogg'})
+_LOSSY_TARGET_CODECS = frozenset({'mp3', 'aac', 'opus', 'wma', 'ogg'})
+
+# Last stderr line of most failed ffmpeg runs; the reason is on the lines before it
+_FFMPEG_FAILED_TRAILER = 'Conversion failed!'
+
+
+class Action(IntEnum):
+    """Outcome of processing a single audio file"""
+    CONVERTED = 1
+    COPIED = 2
+    ERROR = 3
+    SKIPPED = 4
+
+    @property
+    def label(self) -> str:
+        """Lower-case name used by the UI and reports"""
+        return self.name.lower()
 
 
 @dataclass
@@ -16,7 +66,7 @@ class ConversionResult:
     """Result of processing a single audio file"""
     source_path: Path
     target_path: Path
-    action: str  # 'converted', 'copied', 'error'
+    action: Action
     source_size: int  # bytes
     target_size: int  # bytes
     source_format: Dict[str, Any]
@@ -47,7 +97,7 @@ class MusicConverter:
     """Main music conversion class"""
 
     # Supported audio file extensions
-    AUDIO_EXTENSIONS = {'.mp3', '.m4a', '.aac', '.flac', '.ogg', '.wav', '.wma'}
+    AUDIO_EXTENSIONS = frozenset({'.mp3', '.m4a', '.aac', '.flac', '.ogg', '.wav', '.wma'})
 
     # Output format extensions
     FORMAT_EXTENSIONS = {
@@ -57,165 +107,444 @@ class MusicConverter:
         'opus': '.opus'
     }
 
-    def __init__(self, source_dir: Path, target_dir: Path):
+    # Highest bitrate (kbps) each codec can carry; a target at this bitrate never
+    # needs a same-codec source re-encoded
+    MAX_BITRATES = {
+        'mp3': 320
+    }
+
+    # ffprobe results and the settings each target was produced with,
+    # stored in the target directory
+    PROBE_CACHE_NAME = '.ffprobe-cache.json'
+
+    def __init__(self, source_dir: Path, target_dir: Path, ffmpeg_threads: int = 1):
         self.source_dir = Path(source_dir)
         self.target_dir = Path(target_dir)
+        self.ffmpeg_threads = max(1, ffmpeg_threads)
         self.results: List[ConversionResult] = []
+        self.probe_cache_path = self.target_dir / self.PROBE_CACHE_NAME
+        self._probe_cache: Dict[str, Dict[str, Any]] = self._load_probe_cache()
+
+    def _load_probe_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Load cached ffprobe results from a previous run"""
+        try:
+            with open(self.probe_cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def save_probe_cache(self) -> Optional[str]:
+        """Write cached ffprobe results to the target directory, returning an error message on failure"""
+        try:
+            self.probe_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.probe_cache_path, 'w', encoding='utf-8') as f:
+                json.dump(self._probe_cache, f)
+        except OSError as e:
+            return str(e)
+        return None
+
+    def prune_probe_cache(self, audio_files: List[Path]):
+        """Drop cache entries for source files that are no longer present"""
+        keep = {str(fp) for fp in audio_files}
+        self._probe_cache = {key: entry for key, entry in self._probe_cache.items() if key in keep}
+
+    def _current_cache_entry(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """Return the cache entry for a file, replacing it with an empty one if the file changed"""
+        try:
+            st = file_path.stat()
+        except OSError:
+            return None
+        key = str(file_path)
+        entry = self._probe_cache.get(key)
+        if not entry or entry.get('mtime_ns') != st.st_mtime_ns or entry.get('size') != st.st_size:
+            entry = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size}
+            self._probe_cache[key] = entry
+        return entry
+
+    def cache_audio_info(self, file_path: Path, audio_info: AudioInfo):
+        """Store audio info keyed by path, mtime and size"""
+        entry = self._current_cache_entry(file_path)
+        if entry is not None:
+            entry['info'] = asdict(audio_info)
+
+    def record_target(self, file_path: Path, target_codec: str, target_bitrate: int):
+        """Remember the codec and bitrate a source file's complete target was produced with"""
+        entry = self._current_cache_entry(file_path)
+        if entry is not None:
+            entry['target'] = {'codec': target_codec.lower(), 'bitrate': target_bitrate}
+
+    def forget_target(self, file_path: Path):
+        """Drop the target record of a source file whose target was rewritten"""
+        entry = self._probe_cache.get(str(file_path))
+        if entry:
+            entry.pop('target', None)
+
+    def get_cached_audio_info(self, file_path: Path) -> Optional[AudioInfo]:
+        """Return cached audio info if the file is unchanged since it was probed"""
+        entry = self._probe_cache.get(str(file_path))
+        if not entry:
+            return None
+        try:
+            st = file_path.stat()
+        except OSError:
+            return None
+        if entry.get('mtime_ns') != st.st_mtime_ns or entry.get('size') != st.st_size:
+            return None
+        try:
+            return AudioInfo(**entry['info'])
+        except (KeyError, TypeError):
+            return None
 
     def scan_directory(self) -> List[Path]:
         """Recursively scan for audio files in source directory"""
-        audio_files = []
-
         if not self.source_dir.exists():
             raise FileNotFoundError(f"Source directory does not exist: {self.source_dir}")
 
-        for file_path in self.source_dir.rglob('*'):
-            if file_path.is_file() and file_path.suffix.lower() in self.AUDIO_EXTENSIONS:
-                audio_files.append(file_path)
+        return sorted(self._iter_audio_files(str(self.source_dir)))
 
-        return sorted(audio_files)
+    def _iter_audio_files(self, directory: str):
+        """Walk a directory with os.scandir, yielding audio files without extra stat calls"""
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        yield from self._iter_audio_files(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in self.AUDIO_EXTENSIONS and entry.is_file():
+                        yield Path(entry.path)
+        except PermissionError:
+            # Unreadable directories are skipped, as Path.rglob did
+            pass
+
+    def prefetch_audio_info(self, audio_files: List[Path]):
+        """Probe uncached files concurrently so later get_audio_info calls are cache hits"""
+        pending = [fp for fp in audio_files if self.get_cached_audio_info(fp) is None]
+        if not pending:
+            return
+
+        # ffprobe takes a single input, so overlap the process spawns with threads instead
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+            for file_path, audio_info in zip(pending, executor.map(self._try_probe_audio_info, pending)):
+                if audio_info is not None:
+                    self.cache_audio_info(file_path, audio_info)
+
+    def _try_probe_audio_info(self, file_path: Path) -> Optional[AudioInfo]:
+        """Probe a file, leaving errors to be reported when it is processed"""
+        try:
+            return self._probe_audio_info(file_path)
+        except Exception:
+            return None
 
     def get_audio_info(self, file_path: Path) -> AudioInfo:
-        """Extract audio information using ffprobe"""
-        cmd = [
+        """Get audio information, probing with ffprobe on a cache miss"""
+        audio_info = self.get_cached_audio_info(file_path)
+        if audio_info is None:
+            audio_info = self._probe_audio_info(file_path)
+            self.cache_audio_info(file_path, audio_info)
+        return audio_info
+
+    async def get_audio_info_async(self, file_path: Path) -> AudioInfo:
+        """Get audio information without blocking the event loop on probing"""
+        audio_info = self.get_cached_audio_info(file_path)
+        if audio_info is None and av is not None:
+            # PyAV opens the file in-process; keep that blocking I/O off the event loop
+            loop = asyncio.get_running_loop()
+            audio_info = await loop.run_in_executor(None, self._probe_with_pyav, file_path)
+            self.cache_audio_info(file_path, audio_info)
+        elif audio_info is None:
+            proc = await asyncio.create_subprocess_exec(
+                *self._build_probe_command(file_path),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            stdout, stderr = await proc.communicate()
+            if proc.returncode != 0:
+                raise ValueError(f"Failed to analyze audio file: {stderr.decode('utf-8', errors='replace')}")
+            audio_info = self._parse_probe_output(stdout)
+            self.cache_audio_info(file_path, audio_info)
+        return audio_info
+
+    async def _try_get_audio_info_async(self, file_path: Path) -> Optional[AudioInfo]:
+        """Get audio information, returning None if the file can't be probed"""
+        try:
+            return await self.get_audio_info_async(file_path)
+        except Exception:
+            return None
+
+    def _build_probe_command(self, file_path: Path) -> List[str]:
+        """Build ffprobe command for reading stream and format info"""
+        # Only ask for the first audio stream and the fields AudioInfo uses, so
+        # ffprobe skips tag/side-data serialization and the JSON stays small
+        return [
             'ffprobe',
             '-v', 'quiet',
             '-print_format', 'json',
-            '-show_format',
-            '-show_streams',
+            '-select_streams', 'a:0',
+            '-show_entries', 'stream=codec_type,codec_name,bit_rate,sample_rate,channels:format=bit_rate,duration',
             str(file_path)
         ]
 
+    def _probe_audio_info(self, file_path: Path) -> AudioInfo:
+        """Extract audio information with PyAV, or ffprobe when PyAV isn't installed"""
+        if av is not None:
+            return self._probe_with_pyav(file_path)
+
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            data = json.loads(result.stdout)
+            # Parse the raw bytes; decoding to str first would only be thrown away
+            result = subprocess.run(self._build_probe_command(file_path), capture_output=True, check=True)
+        except subprocess.CalledProcessError as e:
+            stderr = e.stderr.decode('utf-8', errors='replace') if e.stderr else ''
+            raise ValueError(f"Failed to analyze audio file: {stderr}")
 
-            # Find audio stream
-            audio_stream = None
-            for stream in data.get('streams', []):
-                if stream.get('codec_type') == 'audio':
-                    audio_stream = stream
-                    break
+        return self._parse_probe_output(result.stdout)
 
-            if not audio_stream:
+    def _probe_with_pyav(self, file_path: Path) -> AudioInfo:
+        """Extract audio information in-process using PyAV (libav bindings)"""
+        try:
+            container = av.open(str(file_path))
+        except Exception as e:
+            raise ValueError(f"Failed to analyze audio file: {e}")
+
+        with container:
+            if not container.streams.audio:
                 raise ValueError("No audio stream found in file")
 
-            # Extract information
-            codec = audio_stream.get('codec_name', 'unknown')
-            bitrate_str = audio_stream.get('bit_rate') or data.get('format', {}).get('bit_rate')
-            bitrate = int(bitrate_str) if bitrate_str else None
-            sample_rate = int(audio_stream.get('sample_rate', 0)) if audio_stream.get('sample_rate') else None
-            duration = float(data.get('format', {}).get('duration', 0)) if data.get('format', {}).get('duration') else None
-            channels = audio_stream.get('channels')
+            stream = container.streams.audio[0]
+            codec_context = stream.codec_context
+            # canonical_name matches ffprobe's codec_name (e.g. 'mp3', not the 'mp3float' decoder)
+            codec = getattr(codec_context.codec, 'canonical_name', codec_context.name) or 'unknown'
+            bitrate = codec_context.bit_rate or container.bit_rate or None
 
             return AudioInfo(
                 codec=codec,
                 bitrate=bitrate,
-                sample_rate=sample_rate,
-                duration=duration,
-                channels=channels
+                sample_rate=codec_context.sample_rate or None,
+                duration=container.duration / av.time_base if container.duration else None,
+                channels=codec_context.channels or None
             )
 
-        except subprocess.CalledProcessError as e:
-            raise ValueError(f"Failed to analyze audio file: {e.stderr}")
+    def _parse_probe_output(self, output: bytes) -> AudioInfo:
+        """Build AudioInfo from ffprobe's JSON output"""
+        try:
+            data = json_loads(output)
         except json.JSONDecodeError as e:
             raise ValueError(f"Failed to parse ffprobe output: {e}")
 
+        # Find audio stream
+        audio_stream = None
+        for stream in data.get('streams', []):
+            if stream.get('codec_type') == 'audio':
+                audio_stream = stream
+                break
+
+        if not audio_stream:
+            raise ValueError("No audio stream found in file")
+
+        # Extract information
+        format_info = data.get('format', {})
+        codec = audio_stream.get('codec_name', 'unknown')
+        bitrate_str = audio_stream.get('bit_rate') or format_info.get('bit_rate')
+        bitrate = int(bitrate_str) if bitrate_str else None
+        sample_rate_str = audio_stream.get('sample_rate')
+        sample_rate = int(sample_rate_str) if sample_rate_str else None
+        duration_str = format_info.get('duration')
+        duration = float(duration_str) if duration_str else None
+        channels = audio_stream.get('channels')
+
+        return AudioInfo(
+            codec=codec,
+            bitrate=bitrate,
+            sample_rate=sample_rate,
+            duration=duration,
+            channels=channels
+        )
+
+    def quick_needs_conversion(self, input_path: Path, target_codec: str, target_bitrate: int) -> Optional[bool]:
+        """Decide from the extension alone when possible; None means the file must be probed"""
+        source_ext = input_path.suffix.lower()
+        codec = target_codec.lower()
+
+        # Lossless source to lossy target - always convert
+        if source_ext == '.flac' and codec != 'flac':
+            return True
+
+        # Same format at the codec's maximum bitrate - never worth re-encoding
+        if source_ext == self.FORMAT_EXTENSIONS.get(codec) and target_bitrate >= self.MAX_BITRATES.get(codec, float('inf')):
+            return False
+
+        return None
+
     def needs_conversion(self, audio_info: AudioInfo, target_codec: str, target_bitrate: int) -> bool:
         """Determine if a file needs conversion"""
         source_codec = audio_info.codec.lower()
-        source_bitrate = audio_info.bitrate if audio_info.bitrate else 0
+        target = target_codec.lower()
+        source_bitrate = audio_info.bitrate or 0
         target_bitrate_bps = target_bitrate * 1000
 
-        # If codec doesn't match, may still need conversion
-        if source_codec != target_codec.lower():
-            # Lossless source to lossy target - always convert
-            if source_codec == 'flac':
-                return True
-
-            # Lossy source to lossy target
-            if source_codec in ['mp3', 'aac', 'mp3', 'wma', 'ogg'] and target_codec.lower() in ['mp3', 'aac', 'opus', 'wma', 'ogg']:
-                # Check if bitrates are similar (within 10% tolerance)
-                bitrate_diff_percent = abs(source_bitrate - target_bitrate_bps) / source_bitrate * 100 if source_bitrate > 0 else 0
+        # Same codec - the common case on an already converted library.
+        # Only convert when downsampling to reduce file size; never upsample
+        if source_codec == target:
+            return source_bitrate > target_bitrate_bps
 
-                # If bitrates are similar and source is already lossy, skip conversion
-                # to avoid quality loss from re-encoding
-                if bitrate_diff_percent < 10:  # Within 10% tolerance
-                    return False
+        # Lossless source to lossy target - always convert
+        if source_codec == 'flac':
+            return True
 
+        # Lossy source to lossy target
+        if source_codec in _LOSSY_SOURCE_CODECS and target in _LOSSY_TARGET_CODECS:
+            # If bitrates are similar (within 10% tolerance) and source is already lossy,
+            # skip conversion to avoid quality loss from re-encoding
+            if source_bitrate > 0 and abs(source_bitrate - target_bitrate_bps) * 10 >= source_bitrate:
                 # Otherwise convert (upgrading quality or changing format)
                 return True
-
-            # Different codec types (e.g., lossy to lossless, or non-standard codecs)
-            return True
-
-        # Same codec - check bitrate
-        if source_bitrate > target_bitrate_bps:
-            # Downsampling - convert to reduce file size
-            return True
-        elif source_bitrate < target_bitrate_bps:
-            # Upsampling - don't convert to avoid unnecessary re-encoding
-            return False
-        else:
-            # Identical codec and bitrate - no conversion needed
             return False
 
+        # Different codec types (e.g., lossy to lossless, or non-standard codecs)
+        return True
+
     def build_ffmpeg_command(self, input_path: Path, output_path: Path,
                            target_codec: str, target_bitrate: int) -> List[str]:
         """Build ffmpeg command for conversion"""
-        base_cmd = ['ffmpeg', '-i', str(input_path), '-y']  # -y to overwrite
+        return self.build_multi_output_command(input_path, [(target_codec, target_bitrate, output_path)])
+
+    def build_multi_output_command(self, input_path: Path,
+                                   outputs: List[Tuple[str, int, Path]]) -> List[str]:
+        """Build a single ffmpeg command that decodes once and writes every (codec, bitrate, path) output"""
+        # -v error keeps stderr down to the actual error messages
+        cmd = ['ffmpeg', '-hide_banner', '-v', 'error', '-i', str(input_path), '-y']  # -y to overwrite
+
+        # Output options bind to the next output file only, so every output
+        # carries its own full option set
+        for target_codec, target_bitrate, output_path in outputs:
+            cmd.extend(self._build_output_args(output_path, target_codec, target_bitrate))
+
+        return cmd
+
+    def _build_output_args(self, output_path: Path, target_codec: str, target_bitrate: int) -> List[str]:
+        """Build the per-output part of an ffmpeg command"""
+        codec = target_codec.lower()
 
         # Codec-specific settings
-        if target_codec.lower() == 'mp3':
-            cmd = base_cmd + ['-c:a', 'libmp3lame', '-b:a', f'{target_bitrate}k']
-        elif target_codec.lower() == 'aac':
-            cmd = base_cmd + ['-c:a', 'aac', '-b:a', f'{target_bitrate}k']
-            # For AAC with M4A container, we need to handle album art properly
-            # Use mp4 container format and handle embedded artwork
-            cmd.extend(['-c:v', 'copy'])  # Copy album art as-is
-        elif target_codec.lower() == 'flac':
-            cmd = base_cmd + ['-c:a', 'flac', '-compression_level', '8']
-        elif target_codec.lower() == 'opus':
-            cmd = base_cmd + ['-c:a', 'libopus', '-b:a', f'{target_bitrate}k']
-        else:
+        codec_args = _CODEC_ARGS.get(codec)
+        if codec_args is None:
             raise ValueError(f"Unsupported target codec: {target_codec}")
+        # Map streams per output: the first audio stream (the one ffprobe
+        # reads), plus the (optional) cover art, copied as-is, for targets
+        # that can hold it
+        args = ['-map', '0:a:0']
+        if codec in _COVER_ART_CODECS:
+            args.extend(['-map', '0:v?'])
+        args.extend(codec_args(target_bitrate))
+        if codec in _COVER_ART_CODECS:
+            args.extend(['-c:v', 'copy', '-disposition:v', 'attached_pic'])
+
+        # Cap ffmpeg's internal threads so parallel workers don't oversubscribe the CPU
+        args.extend(['-threads', str(self.ffmpeg_threads)])
 
         # Preserve metadata
-        cmd.extend(['-map_metadata', '0'])
+        args.extend(['-map_metadata', '0'])
 
         # For AAC/M4A, ensure proper container format
-        if target_codec.lower() == 'aac':
-            cmd.extend(['-movflags', '+faststart'])  # Optimize for streaming
+        if codec == 'aac':
+            args.extend(['-movflags', '+faststart'])  # Optimize for streaming
             # Force mp4 container format
-            cmd.extend(['-f', 'mp4'])
+            args.extend(['-f', 'mp4'])
 
         # Output path
-        cmd.append(str(output_path))
+        args.append(str(output_path))
 
-        return cmd
+        return args
 
     def convert_file(self, input_path: Path, output_path: Path,
-                    target_codec: str, target_bitrate: int) -> bool:
-        """Convert audio file using ffmpeg"""
-        cmd = self.build_ffmpeg_command(input_path, output_path, target_codec, target_bitrate)
+                    target_codec: str, target_bitrate: int) -> Tuple[bool, Optional[str]]:
+        """Convert audio file using ffmpeg, returning (success, error message)"""
+        return asyncio.run(self.convert_file_async(input_path, output_path, target_codec, target_bitrate))
+
+    async def convert_file_async(self, input_path: Path, output_path: Path,
+                                 target_codec: str, target_bitrate: int) -> Tuple[bool, Optional[str]]:
+        """Convert audio file with an ffmpeg subprocess managed by the event loop"""
+        # ffmpeg writes to a temporary name that only replaces the target on
+        # success, so a failed or interrupted run never leaves a partial file
+        partial_path = self._partial_path(output_path)
+        cmd = self.build_ffmpeg_command(input_path, partial_path, target_codec, target_bitrate)
 
         try:
             # Run ffmpeg with suppressed output but allow error messages
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            return True
-        except subprocess.CalledProcessError as e:
-            # Print error for debugging but don't crash
-            print(f"FFmpeg error for {input_path.name}: {e.stderr}")
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                _, stderr = await proc.communicate()
+            except BaseException:
+                # Cancelled (e.g. Ctrl-C) - stop ffmpeg before its output is removed
+                if proc.returncode is None:
+                    try:
+                        proc.kill()
+                    except ProcessLookupError:
+                        pass
+                    await proc.wait()
+                raise
+            if proc.returncode == 0:
+                os.replace(partial_path, output_path)
+                return True, None
+        except BaseException:
+            self._remove_partial(partial_path)
+            raise
+
+        self._remove_partial(partial_path)
+
+        # Don't print here; the caller reports errors once progress is done.
+        # Keep every error line, minus ffmpeg's generic trailer, on one line
+        lines = [line.strip() for line in stderr.decode('utf-8', errors='replace').splitlines()]
+        lines = [line for line in lines if line and line != _FFMPEG_FAILED_TRAILER]
+        return False, "; ".join(lines) if lines else f"ffmpeg exited with status {proc.returncode}"
+
+    def copy_file(self, input_path: Path, output_path: Path) -> Tuple[bool, Optional[str]]:
+        """Copy file without conversion, returning (success, error message)"""
+        # Copy under a temporary name, as convert_file_async does
+        partial_path = self._partial_path(output_path)
+        try:
+            # Kernel-side copy (reflink on Btrfs/XFS) when available, else shutil's sendfile path
+            if not self._copy_file_range(input_path, partial_path):
+                shutil.copyfile(input_path, partial_path)
+            shutil.copystat(input_path, partial_path)
+            os.replace(partial_path, output_path)
+            return True, None
+        except Exception as e:
+            self._remove_partial(partial_path)
+            return False, str(e)
+
+    def _partial_path(self, output_path: Path) -> Path:
+        """Temporary path an output is written to before being renamed into place"""
+        # Keep the extension so ffmpeg still picks the right muxer
+        return output_path.with_name(f".{output_path.stem}.partial{output_path.suffix}")
+
+    def _remove_partial(self, partial_path: Path):
+        """Delete a leftover temporary output, if any"""
+        try:
+            partial_path.unlink()
+        except OSError:
+            pass
+
+    def _copy_file_range(self, input_path: Path, output_path: Path) -> bool:
+        """Copy file contents with os.copy_file_range, returning False if unsupported"""
+        if not hasattr(os, 'copy_file_range'):
             return False
 
-    def copy_file(self, input_path: Path, output_path: Path) -> bool:
-        """Copy file without conversion"""
         try:
-            import shutil
-            shutil.copy2(input_path, output_path)
-            return True
-        except Exception as e:
-            print(f"Copy error for {input_path.name}: {e}")
+            with open(input_path, 'rb') as src, open(output_path, 'wb') as dst:
+                remaining = os.fstat(src.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            return remaining == 0
+        except OSError:
+            # e.g. EXDEV/ENOSYS/EINVAL on older kernels or unsupported filesystems
             return False
 
     def get_file_size(self, file_path: Path) -> int:
@@ -225,45 +554,96 @@ class MusicConverter:
         except FileNotFoundError:
             return 0
 
-    def process_file(self, input_path: Path, target_codec: str, target_bitrate: int) -> ConversionResult:
-        """Process a single audio file"""
+    def get_output_path(self, input_path: Path, target_codec: str) -> Path:
+        """Get the target path for a source file"""
+        # Calculate relative path and output path
+        relative_path = input_path.relative_to(self.source_dir)
+
+        # Change extension based on target format
+        target_ext = self.FORMAT_EXTENSIONS.get(target_codec.lower(), f'.{target_codec}')
+        return self.target_dir / relative_path.with_suffix(target_ext)
+
+    def target_is_current(self, input_path: Path, target_codec: str, target_bitrate: int) -> bool:
+        """Check whether the target was produced from the unchanged source with the same settings"""
         try:
-            # Get source file info
-            audio_info = self.get_audio_info(input_path)
-            source_size = self.get_file_size(input_path)
+            source_stat = input_path.stat()
+            target_mtime = self.get_output_path(input_path, target_codec).stat().st_mtime_ns
+        except (OSError, ValueError):
+            return False
 
-            # Calculate relative path and output path
-            relative_path = input_path.relative_to(self.source_dir)
+        # Without a matching record we can't tell which codec/bitrate the target has
+        entry = self._probe_cache.get(str(input_path))
+        if (not entry or entry.get('mtime_ns') != source_stat.st_mtime_ns
+                or entry.get('size') != source_stat.st_size):
+            return False
+        if entry.get('target') != {'codec': target_codec.lower(), 'bitrate': target_bitrate}:
+            return False
 
-            # Change extension based on target format
-            target_ext = self.FORMAT_EXTENSIONS.get(target_codec.lower(), f'.{target_codec}')
-            output_path = self.target_dir / relative_path.with_suffix(target_ext)
+        return target_mtime >= source_stat.st_mtime_ns
 
-            # Create output directory if it doesn't exist
-            output_path.parent.mkdir(parents=True, exist_ok=True)
+    def make_skipped_result(self, input_path: Path, target_codec: str) -> ConversionResult:
+        """Build the result for a file whose target is already up to date"""
+        output_path = self.get_output_path(input_path, target_codec)
+        audio_info = self.get_cached_audio_info(input_path)
 
-            # Determine action
-            needs_conversion_result = self.needs_conversion(audio_info, target_codec, target_bitrate)
+        return ConversionResult(
+            source_path=input_path,
+            target_path=output_path,
+            action=Action.SKIPPED,
+            source_size=self.get_file_size(input_path),
+            target_size=self.get_file_size(output_path),
+            source_format=asdict(audio_info) if audio_info else {}
+        )
+
+    def process_file(self, input_path: Path, target_codec: str, target_bitrate: int) -> ConversionResult:
+        """Process a single audio file"""
+        return asyncio.run(self.process_file_async(input_path, target_codec, target_bitrate))
+
+    async def process_file_async(self, input_path: Path, target_codec: str, target_bitrate: int) -> ConversionResult:
+        """Process a single audio file, awaiting ffprobe/ffmpeg instead of blocking a thread"""
+        probe = None
+        try:
+            # Determine action, probing only when the extension doesn't decide it
+            needs_conversion_result = self.quick_needs_conversion(input_path, target_codec, target_bitrate)
+            if needs_conversion_result is None:
+                audio_info = await self.get_audio_info_async(input_path)
+                needs_conversion_result = self.needs_conversion(audio_info, target_codec, target_bitrate)
+            else:
+                audio_info = self.get_cached_audio_info(input_path)
+                if audio_info is None:
+                    # The report still wants the source bitrate; probe alongside
+                    # the conversion so the decision doesn't wait for it
+                    probe = asyncio.ensure_future(self._try_get_audio_info_async(input_path))
+
+            source_size = self.get_file_size(input_path)
+            output_path = self.get_output_path(input_path, target_codec)
 
             if needs_conversion_result:
                 # Convert file
-                success = self.convert_file(input_path, output_path, target_codec, target_bitrate)
-                action = 'converted' if success else 'error'
+                success, error = await self.convert_file_async(input_path, output_path, target_codec, target_bitrate)
+                action = Action.CONVERTED if success else Action.ERROR
             else:
-                # Copy file
-                success = self.copy_file(input_path, output_path)
-                action = 'copied' if success else 'error'
+                # Copy file off the event loop; the copy itself blocks
+                loop = asyncio.get_running_loop()
+                success, error = await loop.run_in_executor(None, self.copy_file, input_path, output_path)
+                action = Action.COPIED if success else Action.ERROR
+
+            if success:
+                # The target was rewritten; it is recorded again once it is complete
+                self.forget_target(input_path)
+
+            if probe is not None:
+                audio_info = await probe
 
             # Get target file size
             target_size = self.get_file_size(output_path) if success else 0
 
             # Create source format info dict
-            source_format = {
-                'codec': audio_info.codec,
-                'bitrate': audio_info.bitrate,
-                'sample_rate': audio_info.sample_rate,
-                'duration': audio_info.duration
-            }
+            if audio_info:
+                source_format = asdict(audio_info)
+            else:
+                # Not probed; the extension is all we know about the source
+                source_format = {'codec': input_path.suffix.lower().lstrip('.')}
 
             result = ConversionResult(
                 source_path=input_path,
@@ -272,17 +652,19 @@ class MusicConverter:
                 source_size=source_size,
                 target_size=target_size,
                 source_format=source_format,
-                error_message=None if success else f"{'Conversion' if needs_conversion_result else 'Copy'} failed"
+                error_message=None if success else f"{'Conversion' if needs_conversion_result else 'Copy'} failed: {error}"
             )
 
             return result
 
         except Exception as e:
+            if probe is not None:
+                probe.cancel()
             # Error processing file
             return ConversionResult(
                 source_path=input_path,
                 target_path=input_path,  # No target path
-                action='error',
+                action=Action.ERROR,
                 source_size=self.get_file_size(input_path),
                 target_size=0,
                 source_format={},
@@ -291,6 +673,7 @@ class MusicConverter:
 
     def process_all_files(self, audio_files: List[Path], target_codec: str, target_bitrate: int) -> List[ConversionResult]:
         """Process all audio files"""
+        self.create_output_directories(audio_files)
         results = []
         for input_path in audio_files:
             result = self.process_file(input_path, target_codec, target_bitrate)
@@ -304,13 +687,22 @@ class MusicConverter:
         if not self.results:
             return {}
 
-        total_files = len(self.results)
-        converted_files = len([r for r in self.results if r.action == 'converted'])
-        copied_files = len([r for r in self.results if r.action == 'copied'])
-        error_files = len([r for r in self.results if r.action == 'error'])
+        # Single pass over results
+        total_files = converted_files = copied_files = error_files = skipped_files = 0
+        total_source_size = total_target_size = 0
+        for r in self.results:
+            total_files += 1
+            if r.action == Action.CONVERTED:
+                converted_files += 1
+            elif r.action == Action.COPIED:
+                copied_files += 1
+            elif r.action == Action.ERROR:
+                error_files += 1
+            elif r.action == Action.SKIPPED:
+                skipped_files += 1
+            total_source_size += r.source_size
+            total_target_size += r.target_size
 
-        total_source_size = sum(r.source_size for r in self.results)
-        total_target_size = sum(r.target_size for r in self.results)
         space_saved = total_source_size - total_target_size
 
         return {
@@ -318,6 +710,7 @@ class MusicConverter:
             'converted': converted_files,
             'copied': copied_files,
             'errors': error_files,
+            'skipped': skipped_files,
             'total_source_size': total_source_size,
             'total_target_size': total_target_size,
             'space_saved': space_saved,
@@ -327,3 +720,9 @@ class MusicConverter:
     def create_target_directory(self):
         """Create the target directory if it doesn't exist"""
         self.target_dir.mkdir(parents=True, exist_ok=True)
+
+    def create_output_directories(self, audio_files: List[Path]):
+        """Create each distinct output directory once, ahead of processing"""
+        directories = {self.target_dir / fp.relative_to(self.source_dir).parent for fp in audio_files}
+        for directory in sorted(directories):
+            directory.mkdir(parents=True, exist_ok=True)
@@ -5,8 +5,13 @@ Extracts and applies metadata using mutagen library.
 """
 
 from pathlib import Path
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, Final, List, Optional, Tuple, Union
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 import logging
+import os
+import threading
 
 try:
     from mutagen.mp3 import MP3
@@ -15,45 +20,312 @@ try:
     from mutagen.oggvorbis import OggVorbis
     from mutagen.wave import WAVE
     from mutagen.asf import ASF
+    from mutagen.id3 import TIT2, TPE1, TALB, TRCK, TDRC, TCON, TPE2, TPOS, COMM, APIC
 except ImportError:
     print("Mutagen library not installed. Run: pip install mutagen")
     raise
 
+try:
+    # mutagen-rs is a Rust drop-in for mutagen's readers; tag writes stay on mutagen
+    from mutagen_rs.mp3 import MP3 as MP3Reader
+    from mutagen_rs.mp4 import MP4 as MP4Reader
+    from mutagen_rs.flac import FLAC as FLACReader
+    from mutagen_rs.oggvorbis import OggVorbis as OggVorbisReader
+except ImportError:
+    MP3Reader, MP4Reader, FLACReader, OggVorbisReader = MP3, MP4, FLAC, OggVorbis
+
+
+# ID3 frame -> field, for MP3 extraction
+_MP3_TAG_MAP: Final = MappingProxyType({
+    'TIT2': 'title',
+    'TPE1': 'artist',
+    'TALB': 'album',
+    'TRCK': 'track',
+    'TDRC': 'year',
+    'TCON': 'genre',
+    'TPE2': 'albumartist',
+    'TPOS': 'discnumber',
+    'COMM::eng': 'comment',
+    'TIT3': 'subtitle'
+})
+
+# MP4 atom -> field, for M4A/AAC extraction
+_MP4_TAG_MAP: Final = MappingProxyType({
+    '\xa9nam': 'title',
+    '\xa9ART': 'artist',
+    '\xa9alb': 'album',
+    'trkn': 'track',
+    '\xa9day': 'year',
+    '\xa9gen': 'genre',
+    'aART': 'albumartist',
+    'disk': 'discnumber',
+    '\xa9cmt': 'comment',
+    '\xa9lyr': 'lyrics'
+})
+
+# Vorbis comment (lower-cased) -> field, for FLAC extraction
+_FLAC_TAG_MAP: Final = MappingProxyType({
+    'title': 'title',
+    'artist': 'artist',
+    'album': 'album',
+    'tracknumber': 'track',
+    'date': 'year',
+    'genre': 'genre',
+    'albumartist': 'albumartist',
+    'discnumber': 'discnumber',
+    'comment': 'comment',
+    'lyrics': 'lyrics'
+})
+
+# Vorbis comment (lower-cased) -> field, for OGG extraction
+_OGG_TAG_MAP: Final = MappingProxyType({
+    'title': 'title',
+    'artist': 'artist',
+    'album': 'album',
+    'tracknumber': 'track',
+    'date': 'year',
+    'genre': 'genre',
+    'albumartist': 'albumartist',
+    'discnumber': 'discnumber',
+    'comment': 'comment'
+})
+
+# ID3 frame -> field, for WAV extraction
+_WAV_TAG_MAP: Final = MappingProxyType({
+    'TIT2': 'title',
+    'TPE1': 'artist',
+    'TALB': 'album',
+    'TRCK': 'track',
+    'TDRC': 'year',
+    'TCON': 'genre'
+})
+
+# ASF attribute -> field, for WMA extraction
+_WMA_TAG_MAP: Final = MappingProxyType({
+    'Title': 'title',
+    'Author': 'artist',
+    'Album': 'album',
+    'WM/TrackNumber': 'track',
+    'WM/Year': 'year',
+    'WM/Genre': 'genre',
+    'WM/AlbumArtist': 'albumartist',
+    'WM/PartOfSet': 'discnumber',
+    'Description': 'comment'
+})
+
+# Field -> ID3 frame class, for MP3 application
+_MP3_APPLY_MAP: Final = MappingProxyType({
+    'title': TIT2,
+    'artist': TPE1,
+    'album': TALB,
+    'track': TRCK,
+    'year': TDRC,
+    'genre': TCON,
+    'albumartist': TPE2,
+    'discnumber': TPOS
+})
+
+# Field -> MP4 atom, for M4A application
+_MP4_APPLY_MAP: Final = MappingProxyType({
+    'title': '\xa9nam',
+    'artist': '\xa9ART',
+    'album': '\xa9alb',
+    'track': 'trkn',
+    'year': '\xa9day',
+    'genre': '\xa9gen',
+    'albumartist': 'aART',
+    'discnumber': 'disk',
+    'comment': '\xa9cmt',
+    'lyrics': '\xa9lyr'
+})
+
+# Field -> Vorbis comment, for FLAC application
+_FLAC_APPLY_MAP: Final = MappingProxyType({
+    'title': 'TITLE',
+    'artist': 'ARTIST',
+    'album': 'ALBUM',
+    'track': 'TRACKNUMBER',
+    'year': 'DATE',
+    'genre': 'GENRE',
+    'albumartist': 'ALBUMARTIST',
+    'discnumber': 'DISCNUMBER',
+    'comment': 'COMMENT',
+    'lyrics': 'LYRICS'
+})
+
+# Field -> Vorbis comment, for Opus application
+_OPUS_APPLY_MAP: Final = MappingProxyType({
+    'title': 'TITLE',
+    'artist': 'ARTIST',
+    'album': 'ALBUM',
+    'track': 'TRACKNUMBER',
+    'year': 'DATE',
+    'genre': 'GENRE',
+    'albumartist': 'ALBUMARTIST',
+    'discnumber': 'DISCNUMBER',
+    'comment': 'COMMENT'
+})
+
+# (field, label) pairs shown by get_metadata_summary, in display order
+_SUMMARY_FIELDS: Final = (
+    ('title', 'Title'),
+    ('artist', 'Artist'),
+    ('album', 'Album'),
+    ('year', 'Year'),
+    ('genre', 'Genre')
+)
+
+
+# Maximum number of files whose extracted metadata is kept in memory
+METADATA_CACHE_SIZE: Final = 4096
+
+# Bytes at the start/end of a file where tags usually live (ID3v2/FLAC
+# blocks up front, ID3v1/APE/moov at the end); read ahead before extraction
+_TAG_HEAD_BYTES: Final = 64 * 1024
+_TAG_TAIL_BYTES: Final = 16 * 1024
+
+
+def _prefetch_tag_regions(file_paths: List[Path]):
+    """Ask the kernel to read the tag regions of all files ahead of parsing"""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+
+    # WILLNEED only queues readahead and returns, so the whole batch is in
+    # flight at once and mutagen's later reads hit the page cache
+    for file_path in file_paths:
+        try:
+            fd = os.open(file_path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            size = os.fstat(fd).st_size
+            os.posix_fadvise(fd, 0, _TAG_HEAD_BYTES, os.POSIX_FADV_WILLNEED)
+            if size > _TAG_HEAD_BYTES:
+                tail = max(_TAG_HEAD_BYTES, size - _TAG_TAIL_BYTES)
+                os.posix_fadvise(fd, tail, size - tail, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+class _LazyArtwork:
+    """Handle to a file's embedded cover art, read only when bytes() is called"""
+    __slots__ = ('path', 'fmt')
+
+    def __init__(self, path: Path, fmt: str):
+        self.path = path
+        self.fmt = fmt
+
+    def bytes(self) -> bytes:
+        """Reopen the source file and return the first embedded picture"""
+        if self.fmt == 'mp3':
+            return MP3Reader(self.path).tags['APIC:'].data
+        if self.fmt == 'mp4':
+            return MP4Reader(self.path).tags['covr'][0]
+        if self.fmt == 'flac':
+            return FLACReader(self.path).pictures[0].data
+        raise ValueError(f"Unsupported artwork format: {self.fmt}")
+
+
+def _artwork_bytes(artwork: Union[bytes, _LazyArtwork]) -> bytes:
+    """Resolve an artwork value from metadata to bytes"""
+    return artwork.bytes() if isinstance(artwork, _LazyArtwork) else artwork
+
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+logger: Final = logging.getLogger(__name__)
 
 
 class MetadataHandler:
     """Handles metadata extraction and application for audio files"""
 
+    __slots__ = ('logger', '_cache', '_cache_lock', '_extractors', '_appliers')
+
     def __init__(self):
         self.logger = logger
 
+        # LRU cache of extraction results keyed by (path, mtime_ns, size)
+        self._cache: OrderedDict[Tuple[str, int, int], Dict[str, Any]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        # Suffix -> handler dispatch tables
+        self._extractors = {
+            '.mp3': self._extract_mp3_metadata,
+            '.m4a': self._extract_mp4_metadata,
+            '.aac': self._extract_mp4_metadata,
+            '.flac': self._extract_flac_metadata,
+            '.ogg': self._extract_ogg_metadata,
+            '.wav': self._extract_wav_metadata,
+            '.wma': self._extract_wma_metadata
+        }
+        self._appliers = {
+            '.mp3': self._apply_mp3_metadata,
+            '.m4a': self._apply_mp4_metadata,
+            '.aac': self._apply_mp4_metadata,
+            '.flac': self._apply_flac_metadata,
+            '.opus': self._apply_opus_metadata
+        }
+
     def extract_metadata(self, file_path: Path) -> Dict[str, Any]:
         """Extract metadata from an audio file"""
-        if not file_path.exists():
+        # A single stat both checks existence and keys the cache
+        path = os.fspath(file_path)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
             raise FileNotFoundError(f"File not found: {file_path}")
 
         suffix = file_path.suffix.lower()
 
+        extractor = self._extractors.get(suffix)
+        if extractor is None:
+            self.logger.warning(f"Unsupported file format for metadata: {suffix}")
+            return {}
+
+        # Unchanged files (same path, mtime and size) are served from the cache
+        key = (path, st.st_mtime_ns, st.st_size)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return dict(cached)
+
         try:
-            if suffix == '.mp3':
-                return self._extract_mp3_metadata(file_path)
-            elif suffix in ['.m4a', '.aac']:
-                return self._extract_mp4_metadata(file_path)
-            elif suffix == '.flac':
-                return self._extract_flac_metadata(file_path)
-            elif suffix == '.ogg':
-                return self._extract_ogg_metadata(file_path)
-            elif suffix == '.wav':
-                return self._extract_wav_metadata(file_path)
-            elif suffix == '.wma':
-                return self._extract_wma_metadata(file_path)
-            else:
-                self.logger.warning(f"Unsupported file format for metadata: {suffix}")
-                return {}
+            metadata = extractor(file_path)
+        except Exception as e:
+            self.logger.error(f"Error extracting metadata from {file_path.name}: {e}")
+            return {}
+
+        with self._cache_lock:
+            self._cache[key] = metadata
+            if len(self._cache) > METADATA_CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+        # Hand out a copy so callers can't modify the cached entry
+        return dict(metadata)
+
+    def clear_cache(self):
+        """Drop all cached extraction results"""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def extract_many(self, file_paths: List[Path]) -> List[Dict[str, Any]]:
+        """Extract metadata from many files concurrently, in input order"""
+        if not file_paths:
+            return []
+
+        _prefetch_tag_regions(file_paths)
+
+        # Tag reads are mostly small seeks/reads, so threads overlap the I/O latency
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+            return list(executor.map(self._extract_metadata_or_empty, file_paths))
+
+    def _extract_metadata_or_empty(self, file_path: Path) -> Dict[str, Any]:
+        """Extract metadata, returning an empty dict on failure"""
+        try:
+            return self.extract_metadata(file_path)
         except Exception as e:
             self.logger.error(f"Error extracting metadata from {file_path.name}: {e}")
             return {}
@@ -61,36 +333,21 @@ class MetadataHandler:
     def _extract_mp3_metadata(self, file_path: Path) -> Dict[str, Any]:
         """Extract metadata from MP3 file"""
         try:
-            audio = MP3(file_path)
+            audio = MP3Reader(file_path)
             tags = {}
 
             if audio.tags:
-                # Standard ID3 tags
-                tag_mapping = {
-                    'TIT2': 'title',
-                    'TPE1': 'artist',
-                    'TALB': 'album',
-                    'TRCK': 'track',
-                    'TDRC': 'year',
-                    'TCON': 'genre',
-                    'TPE2': 'albumartist',
-                    'TPOS': 'discnumber',
-                    'COMM::eng': 'comment',
-                    'TIT3': 'subtitle'
-                }
-
-                for id3_tag, tag_name in tag_mapping.items():
-                    if id3_tag in audio.tags:
-                        value = audio.tags[id3_tag]
-                        if hasattr(value, 'text'):
-                            tags[tag_name] = str(value.text[0])
-                        else:
-                            tags[tag_name] = str(value)
-
-                # Handle artwork
+                get = audio.tags.get
+                for id3_tag, tag_name in _MP3_TAG_MAP.items():
+                    frame = get(id3_tag)
+                    if frame is not None:
+                        value = frame.text[0] if hasattr(frame, 'text') else frame
+                        # Text frames already hold str; only timestamps need str()
+                        tags[tag_name] = value if type(value) is str else str(value)
+
+                # Handle artwork (read lazily, only when it is applied)
                 if 'APIC:' in audio.tags:
-                    artwork_data = audio.tags['APIC:'].data
-                    tags['artwork'] = artwork_data
+                    tags['artwork'] = _LazyArtwork(file_path, 'mp3')
 
             return tags
         except Exception as e:
@@ -100,25 +357,11 @@ class MetadataHandler:
     def _extract_mp4_metadata(self, file_path: Path) -> Dict[str, Any]:
         """Extract metadata from M4A/AAC file"""
         try:
-            audio = MP4(file_path)
+            audio = MP4Reader(file_path)
             tags = {}
 
             if audio.tags:
-                # MP4 tag mapping
-                tag_mapping = {
-                    '\xa9nam': 'title',
-                    '\xa9ART': 'artist',
-                    '\xa9alb': 'album',
-                    'trkn': 'track',
-                    '\xa9day': 'year',
-                    '\xa9gen': 'genre',
-                    'aART': 'albumartist',
-                    'disk': 'discnumber',
-                    '\xa9cmt': 'comment',
-                    '\xa9lyr': 'lyrics'
-                }
-
-                for mp4_tag, tag_name in tag_mapping.items():
+                for mp4_tag, tag_name in _MP4_TAG_MAP.items():
                     if mp4_tag in audio.tags:
                         value = audio.tags[mp4_tag]
                         if isinstance(value, list) and value:
@@ -131,10 +374,9 @@ class MetadataHandler:
                         else:
                             tags[tag_name] = str(value)
 
-                # Handle artwork
+                # Handle artwork (read lazily, only when it is applied)
                 if 'covr' in audio.tags:
-                    artwork_data = audio.tags['covr'][0]
-                    tags['artwork'] = artwork_data
+                    tags['artwork'] = _LazyArtwork(file_path, 'mp4')
 
             return tags
         except Exception as e:
@@ -144,44 +386,25 @@ class MetadataHandler:
     def _extract_flac_metadata(self, file_path: Path) -> Dict[str, Any]:
         """Extract metadata from FLAC file"""
         try:
-            audio = FLAC(file_path)
+            audio = FLACReader(file_path)
             tags = {}
 
             if audio.tags:
-                # FLAC/Vorbis tag mapping (case-insensitive)
-                tag_mapping = {
-                    'title': 'title',
-                    'artist': 'artist',
-                    'album': 'album',
-                    'tracknumber': 'track',
-                    'date': 'year',
-                    'genre': 'genre',
-                    'albumartist': 'albumartist',
-                    'discnumber': 'discnumber',
-                    'comment': 'comment',
-                    'lyrics': 'lyrics'
-                }
-
-                for flac_tag, tag_name in tag_mapping.items():
-                    # Vorbis comments are case-insensitive
-                    for key in audio.tags:
-                        try:
-                            # Handle the case where key might be a tuple or other type
-                            key_str = str(key) if not isinstance(key, str) else key
-                            if key_str.lower() == flac_tag.lower():
-                                value = audio.tags[key]
-                                if isinstance(value, list) and value:
-                                    tags[tag_name] = str(value[0])
-                                else:
-                                    tags[tag_name] = str(value)
-                                break
-                        except (AttributeError, ValueError):
-                            # Skip problematic keys
-                            continue
-
-                # Handle artwork (FLAC can have multiple pictures)
+                # Vorbis comments are case-insensitive; normalize keys once
+                lower_map = self._lowercase_tag_keys(audio.tags)
+
+                for flac_tag, tag_name in _FLAC_TAG_MAP.items():
+                    key = lower_map.get(flac_tag)
+                    if key is not None:
+                        value = audio.tags[key]
+                        if isinstance(value, list) and value:
+                            tags[tag_name] = str(value[0])
+                        else:
+                            tags[tag_name] = str(value)
+
+                # Handle artwork (FLAC can have multiple pictures; read lazily)
                 if audio.pictures:
-                    tags['artwork'] = audio.pictures[0].data
+                    tags['artwork'] = _LazyArtwork(file_path, 'flac')
 
             return tags
         except Exception as e:
@@ -191,43 +414,41 @@ class MetadataHandler:
     def _extract_ogg_metadata(self, file_path: Path) -> Dict[str, Any]:
         """Extract metadata from OGG file"""
         try:
-            audio = OggVorbis(file_path)
+            audio = OggVorbisReader(file_path)
             tags = {}
 
             if audio.tags:
-                tag_mapping = {
-                    'title': 'title',
-                    'artist': 'artist',
-                    'album': 'album',
-                    'tracknumber': 'track',
-                    'date': 'year',
-                    'genre': 'genre',
-                    'albumartist': 'albumartist',
-                    'discnumber': 'discnumber',
-                    'comment': 'comment'
-                }
-
-                for ogg_tag, tag_name in tag_mapping.items():
-                    for key in audio.tags:
-                        try:
-                            # Handle the case where key might be a tuple or other type
-                            key_str = str(key) if not isinstance(key, str) else key
-                            if key_str.lower() == ogg_tag.lower():
-                                value = audio.tags[key]
-                                if isinstance(value, list) and value:
-                                    tags[tag_name] = str(value[0])
-                                else:
-                                    tags[tag_name] = str(value)
-                                break
-                        except (AttributeError, ValueError):
-                            # Skip problematic keys
-                            continue
+                # Vorbis comments are case-insensitive; normalize keys once
+                lower_map = self._lowercase_tag_keys(audio.tags)
+
+                for ogg_tag, tag_name in _OGG_TAG_MAP.items():
+                    key = lower_map.get(ogg_tag)
+                    if key is not None:
+                        value = audio.tags[key]
+                        if isinstance(value, list) and value:
+                            tags[tag_name] = str(value[0])
+                        else:
+                            tags[tag_name] = str(value)
 
             return tags
         except Exception as e:
             self.logger.error(f"Error extracting OGG metadata: {e}")
             return {}
 
+    def _lowercase_tag_keys(self, tags) -> Dict[str, Any]:
+        """Map lower-cased Vorbis comment keys to the keys as stored"""
+        lower_map = {}
+        # keys() rather than iteration: iterating a VCommentDict yields (key, value) pairs
+        for key in tags.keys():
+            try:
+                # Handle the case where key might be a tuple or other type
+                key_str = key if isinstance(key, str) else str(key)
+                lower_map[key_str.lower()] = key
+            except (AttributeError, ValueError):
+                # Skip problematic keys
+                continue
+        return lower_map
+
     def _extract_wav_metadata(self, file_path: Path) -> Dict[str, Any]:
         """Extract metadata from WAV file"""
         try:
@@ -236,23 +457,13 @@ class MetadataHandler:
 
             # WAV files often have limited metadata in ID3 chunks
             if audio.tags:
-                # Similar to MP3 but with WAV-specific handling
-                tag_mapping = {
-                    'TIT2': 'title',
-                    'TPE1': 'artist',
-                    'TALB': 'album',
-                    'TRCK': 'track',
-                    'TDRC': 'year',
-                    'TCON': 'genre'
-                }
-
-                for id3_tag, tag_name in tag_mapping.items():
-                    if id3_tag in audio.tags:
-                        value = audio.tags[id3_tag]
-                        if hasattr(value, 'text'):
-                            tags[tag_name] = str(value.text[0])
-                        else:
-                            tags[tag_name] = str(value)
+                get = audio.tags.get
+                for id3_tag, tag_name in _WAV_TAG_MAP.items():
+                    frame = get(id3_tag)
+                    if frame is not None:
+                        value = frame.text[0] if hasattr(frame, 'text') else frame
+                        # Text frames already hold str; only timestamps need str()
+                        tags[tag_name] = value if type(value) is str else str(value)
 
             return tags
         except Exception as e:
@@ -266,20 +477,7 @@ class MetadataHandler:
             tags = {}
 
             if audio.tags:
-                # WMA/ASF tag mapping
-                tag_mapping = {
-                    'Title': 'title',
-                    'Author': 'artist',
-                    'Album': 'album',
-                    'WM/TrackNumber': 'track',
-                    'WM/Year': 'year',
-                    'WM/Genre': 'genre',
-                    'WM/AlbumArtist': 'albumartist',
-                    'WM/PartOfSet': 'discnumber',
-                    'Description': 'comment'
-                }
-
-                for wma_tag, tag_name in tag_mapping.items():
+                for wma_tag, tag_name in _WMA_TAG_MAP.items():
                     if wma_tag in audio.tags:
                         value = audio.tags[wma_tag]
                         if isinstance(value, list) and value:
@@ -297,14 +495,23 @@ class MetadataHandler:
         try:
             # Extract metadata from source
             metadata = self.extract_metadata(source_path)
+        except Exception as e:
+            self.logger.error(f"Error applying metadata: {e}")
+            return False
 
-            if not metadata:
-                self.logger.info(f"No metadata found in {source_path.name}")
-                return True  # Not an error, just no metadata
+        if not metadata:
+            self.logger.info(f"No metadata found in {source_path.name}")
+            return True  # Not an error, just no metadata
 
-            # Apply metadata to target
-            return self._apply_metadata_to_file(target_path, metadata)
+        return self.apply_cached_metadata(target_path, metadata)
+
+    def apply_cached_metadata(self, target_path: Path, metadata: Dict[str, Any]) -> bool:
+        """Apply already extracted metadata to target file"""
+        if not metadata:
+            return True  # Not an error, just no metadata
 
+        try:
+            return self._apply_metadata_to_file(target_path, metadata)
         except Exception as e:
             self.logger.error(f"Error applying metadata: {e}")
             return False
@@ -313,18 +520,13 @@ class MetadataHandler:
         """Apply metadata to target file"""
         suffix = target_path.suffix.lower()
 
+        applier = self._appliers.get(suffix)
+        if applier is None:
+            self.logger.warning(f"Metadata application not supported for format: {suffix}")
+            return False
+
         try:
-            if suffix == '.mp3':
-                return self._apply_mp3_metadata(target_path, metadata)
-            elif suffix in ['.m4a', '.aac']:
-                return self._apply_mp4_metadata(target_path, metadata)
-            elif suffix == '.flac':
-                return self._apply_flac_metadata(target_path, metadata)
-            elif suffix == '.opus':
-                return self._apply_opus_metadata(target_path, metadata)
-            else:
-                self.logger.warning(f"Metadata application not supported for format: {suffix}")
-                return False
+            return applier(target_path, metadata)
         except Exception as e:
             self.logger.error(f"Error applying metadata to {target_path.name}: {e}")
             return False
@@ -332,27 +534,13 @@ class MetadataHandler:
     def _apply_mp3_metadata(self, target_path: Path, metadata: Dict[str, Any]) -> bool:
         """Apply metadata to MP3 file"""
         try:
-            from mutagen.id3 import ID3, TIT2, TPE1, TALB, TRCK, TDRC, TCON, TPE2, TPOS, COMM, APIC
-
             audio = MP3(target_path)
 
             # Ensure tags exist
             if audio.tags is None:
                 audio.add_tags()
 
-            # Apply text tags
-            tag_mapping = {
-                'title': TIT2,
-                'artist': TPE1,
-                'album': TALB,
-                'track': TRCK,
-                'year': TDRC,
-                'genre': TCON,
-                'albumartist': TPE2,
-                'discnumber': TPOS
-            }
-
-            for field, tag_class in tag_mapping.items():
+            for field, tag_class in _MP3_APPLY_MAP.items():
                 if field in metadata:
                     audio.tags[tag_class.__name__] = tag_class(encoding=3, text=str(metadata[field]))
 
@@ -367,10 +555,11 @@ class MetadataHandler:
                     mime='image/jpeg',
                     type=3,  # Cover (front)
                     desc='Cover',
-                    data=metadata['artwork']
+                    data=_artwork_bytes(metadata['artwork'])
                 )
 
-            audio.save()
+            # Keep at least 1 KB of padding so later tag edits rewrite in place
+            audio.save(v2_version=4, padding=lambda info: max(1024, info.padding))
             return True
 
         except Exception as e:
@@ -382,21 +571,7 @@ class MetadataHandler:
         try:
             audio = MP4(target_path)
 
-            # Apply tags
-            tag_mapping = {
-                'title': '\xa9nam',
-                'artist': '\xa9ART',
-                'album': '\xa9alb',
-                'track': 'trkn',
-                'year': '\xa9day',
-                'genre': '\xa9gen',
-                'albumartist': 'aART',
-                'discnumber': 'disk',
-                'comment': '\xa9cmt',
-                'lyrics': '\xa9lyr'
-            }
-
-            for field, mp4_tag in tag_mapping.items():
+            for field, mp4_tag in _MP4_APPLY_MAP.items():
                 if field in metadata:
                     if field in ['track', 'discnumber']:
                         # Handle track/disc as (current, total) tuple
@@ -410,7 +585,7 @@ class MetadataHandler:
 
             # Add artwork if present
             if 'artwork' in metadata:
-                audio.tags['covr'] = [metadata['artwork']]
+                audio.tags['covr'] = [_artwork_bytes(metadata['artwork'])]
 
             audio.save()
             return True
@@ -424,21 +599,7 @@ class MetadataHandler:
         try:
             audio = FLAC(target_path)
 
-            # Apply tags (FLAC uses Vorbis comments)
-            tag_mapping = {
-                'title': 'TITLE',
-                'artist': 'ARTIST',
-                'album': 'ALBUM',
-                'track': 'TRACKNUMBER',
-                'year': 'DATE',
-                'genre': 'GENRE',
-                'albumartist': 'ALBUMARTIST',
-                'discnumber': 'DISCNUMBER',
-                'comment': 'COMMENT',
-                'lyrics': 'LYRICS'
-            }
-
-            for field, flac_tag in tag_mapping.items():
+            for field, flac_tag in _FLAC_APPLY_MAP.items():
                 if field in metadata:
                     audio.tags[flac_tag] = str(metadata[field])
 
@@ -450,10 +611,11 @@ class MetadataHandler:
                 picture = Picture()
                 picture.type = 3  # Cover (front)
                 picture.mime = 'image/jpeg'
-                picture.data = metadata['artwork']
+                picture.data = _artwork_bytes(metadata['artwork'])
                 audio.add_picture(picture)
 
-            audio.save()
+            # Keep at least 8 KB of padding so later tag edits rewrite in place
+            audio.save(padding=lambda info: max(8192, info.padding))
             return True
 
         except Exception as e:
@@ -465,20 +627,7 @@ class MetadataHandler:
         try:
             audio = OggVorbis(target_path)  # Opus uses similar tag structure
 
-            # Apply tags (case-insensitive)
-            tag_mapping = {
-                'title': 'TITLE',
-                'artist': 'ARTIST',
-                'album': 'ALBUM',
-                'track': 'TRACKNUMBER',
-                'year': 'DATE',
-                'genre': 'GENRE',
-                'albumartist': 'ALBUMARTIST',
-                'discnumber': 'DISCNUMBER',
-                'comment': 'COMMENT'
-            }
-
-            for field, opus_tag in tag_mapping.items():
+            for field, opus_tag in _OPUS_APPLY_MAP.items():
                 if field in metadata:
                     audio.tags[opus_tag] = str(metadata[field])
 
@@ -494,17 +643,9 @@ class MetadataHandler:
         if not metadata:
             return "No metadata found"
 
-        summary_parts = []
-
-        if 'title' in metadata:
-            summary_parts.append(f"Title: {metadata['title']}")
-        if 'artist' in metadata:
-            summary_parts.append(f"Artist: {metadata['artist']}")
-        if 'album' in metadata:
-            summary_parts.append(f"Album: {metadata['album']}")
-        if 'year' in metadata:
-            summary_parts.append(f"Year: {metadata['year']}")
-        if 'genre' in metadata:
-            summary_parts.append(f"Genre: {metadata['genre']}")
+        summary_parts = [
+            f"{label}: {metadata[field]}"
+            for field, label in _SUMMARY_FIELDS if field in metadata
+        ]
 
         return " | ".join(summary_parts) if summary_parts else "Limited metadata"
\ No newline at end of file
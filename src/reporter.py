@@ -6,15 +6,48 @@ Creates markdown reports summarizing conversion results.
 
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, Final, List, TextIO, Tuple
 import os
 
-from src.converter import ConversionResult
+from src.converter import ConversionResult, Action
+
+
+# Size unit thresholds in bytes
+_KB: Final = 1 << 10
+_MB: Final = 1 << 20
+_GB: Final = 1 << 30
+
+# Short description of each target codec for the report footer
+_FORMAT_DESCRIPTIONS: Final = {
+    'mp3': "MP3 is the most widely supported audio format, compatible with virtually all devices and media players.",
+    'aac': "AAC offers better quality than MP3 at the same bitrate and is the standard for Apple devices and streaming services.",
+    'flac': "FLAC is a lossless format that provides perfect audio quality while reducing file size by about 40-50% compared to WAV.",
+    'opus': "Opus is a modern, highly efficient codec that provides excellent quality at very low bitrates."
+}
+
+# Header rows of the converted files table
+_TABLE_HEADER_1: Final = "\n| Original File | Original Format | Target Format | Original Size | Final Size | Reduction |\n"
+_TABLE_HEADER_2: Final = "|---------------|----------------|---------------|---------------|------------|----------|\n"
+
+
+def _no_bitrate(source_format: Dict[str, Any]) -> str:
+    """Explain a missing bitrate: VBR if the source was probed, otherwise not probed"""
+    return "(VBR)" if 'bitrate' in source_format else "(not probed)"
+
+
+def _ofmt(result: ConversionResult) -> str:
+    """Describe a result's original format as "codec @ kbps" (or VBR / not probed)"""
+    original_bitrate = result.source_format.get('bitrate')
+    if original_bitrate:
+        return f"{result.source_format.get('codec', 'unknown')} @ {original_bitrate / 1000:.0f}kbps"
+    return f"{result.source_format.get('codec', 'unknown')} {_no_bitrate(result.source_format)}"
 
 
 class ReportGenerator:
     """Generates markdown reports for music conversion results"""
 
+    __slots__ = ('timestamp',)
+
     def __init__(self):
         self.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
@@ -23,129 +56,132 @@ class ReportGenerator:
         """Generate comprehensive markdown report"""
         report_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(self._build_report_content(results, source_dir, target_dir, codec, bitrate))
+        # Stream the report straight to disk through a 1 MB buffer
+        with open(report_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            self._write_report_content(f, results, source_dir, target_dir, codec, bitrate)
 
         return report_path
 
-    def _build_report_content(self, results: List[ConversionResult],
-                            source_dir: str, target_dir: str,
-                            codec: str, bitrate: int) -> str:
-        """Build the markdown report content"""
-        stats = self._calculate_statistics(results)
-
-        content = []
-        content.append("# Music Conversion Report\n")
-        content.append(f"**Generated:** {self.timestamp}\n")
-
-        content.append("## Summary\n")
-        content.append(f"- **Source Directory:** `{source_dir}`\n")
-        content.append(f"- **Target Directory:** `{target_dir}`\n")
-        content.append(f"- **Target Codec:** {codec.upper()}\n")
-        content.append(f"- **Target Bitrate:** {bitrate if bitrate > 0 else 'Lossless (FLAC)'} kbps\n")
-
-        content.append("\n## Overall Statistics\n")
-        content.append(f"- **Total Files:** {stats['total']}\n")
-        content.append(f"- **Converted:** {stats['converted']}\n")
-        content.append(f"- **Copied (No Conversion Needed):** {stats['copied']}\n")
-        content.append(f"- **Errors:** {stats['errors']}\n")
-        content.append(f"- **Success Rate:** {stats['success_rate']:.1f}%\n")
-
-        content.append("\n## Space Savings\n")
-        content.append(f"- **Original Size:** {self._format_size(stats['original_size'])}\n")
-        content.append(f"- **Final Size:** {self._format_size(stats['final_size'])}\n")
+    def _write_report_content(self, f: TextIO, results: List[ConversionResult],
+                              source_dir: str, target_dir: str,
+                              codec: str, bitrate: int):
+        """Write the markdown report content to an open text file"""
+        stats, (converted_files, copied_files, error_files, skipped_files) = self._calculate_statistics(results)
+
+        w = f.write
+        w("# Music Conversion Report\n")
+        w(f"**Generated:** {self.timestamp}\n")
+
+        w("## Summary\n")
+        w(f"- **Source Directory:** `{source_dir}`\n")
+        w(f"- **Target Directory:** `{target_dir}`\n")
+        w(f"- **Target Codec:** {codec.upper()}\n")
+        w(f"- **Target Bitrate:** {bitrate if bitrate > 0 else 'Lossless (FLAC)'} kbps\n")
+
+        w("\n## Overall Statistics\n")
+        w(f"- **Total Files:** {stats['total']}\n")
+        w(f"- **Converted:** {stats['converted']}\n")
+        w(f"- **Copied (No Conversion Needed):** {stats['copied']}\n")
+        w(f"- **Errors:** {stats['errors']}\n")
+        w(f"- **Skipped (Up to Date):** {stats['skipped']}\n")
+        w(f"- **Success Rate:** {stats['success_rate']:.1f}%\n")
+
+        w("\n## Space Savings\n")
+        w(f"- **Original Size:** {self._format_size(stats['original_size'])}\n")
+        w(f"- **Final Size:** {self._format_size(stats['final_size'])}\n")
 
         if stats['space_saved'] >= 0:
-            content.append(f"- **Space Saved:** {self._format_size(stats['space_saved'])} ")
-            content.append(f"({stats['space_saved_percent']:.1f}%)\n")
+            w(f"- **Space Saved:** {self._format_size(stats['space_saved'])} ")
+            w(f"({stats['space_saved_percent']:.1f}%)\n")
         else:
-            content.append(f"- **Space Increase:** {self._format_size(abs(stats['space_saved']))} ")
-            content.append(f"({abs(stats['space_saved_percent']):.1f}%)\n")
+            w(f"- **Space Increase:** {self._format_size(abs(stats['space_saved']))} ")
+            w(f"({abs(stats['space_saved_percent']):.1f}%)\n")
 
         # Converted Files Section
-        converted_files = [r for r in results if r.action == 'converted']
         if converted_files:
-            content.append("\n## Converted Files\n")
-            content.append(f"{len(converted_files)} files were converted from their original format.\n")
-            content.append("\n| Original File | Original Format | Target Format | Original Size | Final Size | Reduction |\n")
-            content.append("|---------------|----------------|---------------|---------------|------------|----------|\n")
-
-            for result in converted_files:
-                original_format = f"{result.source_format.get('codec', 'unknown')} "
-                original_bitrate = result.source_format.get('bitrate')
-                if original_bitrate:
-                    original_format += f"@ {original_bitrate / 1000:.0f}kbps"
-                else:
-                    original_format += "(VBR)"
-
-                target_bitrate_str = ""
-                if bitrate > 0:
-                    target_bitrate_str = f"@ {bitrate}kbps"
-                else:
-                    target_bitrate_str = "(Lossless)"
-
-                target_format = f"{codec.upper()} {target_bitrate_str}"
-
-                reduction = self._format_size(result.source_size - result.target_size)
-                content.append(f"| {result.source_path.name} | {original_format} | {target_format} | ")
-                content.append(f"{self._format_size(result.source_size)} | {self._format_size(result.target_size)} | {reduction} |\n")
+            w("\n## Converted Files\n")
+            w(f"{len(converted_files)} files were converted from their original format.\n")
+            w(_TABLE_HEADER_1)
+            w(_TABLE_HEADER_2)
+
+            if bitrate > 0:
+                target_format = f"{codec.upper()} @ {bitrate}kbps"
+            else:
+                target_format = f"{codec.upper()} (Lossless)"
+
+            fmt_size = self._format_size
+            w("".join([
+                f"| {r.source_path.name} | {_ofmt(r)} | {target_format} | "
+                f"{fmt_size(r.source_size)} | {fmt_size(r.target_size)} | "
+                f"{fmt_size(r.source_size - r.target_size)} |\n"
+                for r in converted_files
+            ]))
 
         # Copied Files Section
-        copied_files = [r for r in results if r.action == 'copied']
         if copied_files:
-            content.append("\n## Copied Files (No Conversion Needed)\n")
-            content.append(f"{len(copied_files)} files were already in the target format and were copied directly.\n\n")
+            w("\n## Copied Files (No Conversion Needed)\n")
+            w(f"{len(copied_files)} files were already in the target format and were copied directly.\n\n")
 
             for result in copied_files:
-                content.append(f"- `{result.source_path.name}` - ")
-                content.append(f"Already {result.source_format.get('codec', 'unknown')} at ")
+                w(f"- `{result.source_path.name}` - ")
+                w(f"Already {result.source_format.get('codec', 'unknown')} ")
                 original_bitrate = result.source_format.get('bitrate')
                 if original_bitrate:
-                    content.append(f"{original_bitrate / 1000:.0f}kbps - ")
-                content.append("No conversion needed\n")
+                    w(f"at {original_bitrate / 1000:.0f}kbps - ")
+                else:
+                    w(f"{_no_bitrate(result.source_format)} - ")
+                w("No conversion needed\n")
 
         # Error Files Section
-        error_files = [r for r in results if r.action == 'error']
         if error_files:
-            content.append("\n## Errors\n")
-            content.append(f"{len(error_files)} files encountered errors during processing.\n\n")
+            w("\n## Errors\n")
+            w(f"{len(error_files)} files encountered errors during processing.\n\n")
 
             for result in error_files:
-                content.append(f"- `{result.source_path.name}`: ")
-                content.append(f"{result.error_message or 'Unknown error'}\n")
+                w(f"- `{result.source_path.name}`: ")
+                w(f"{result.error_message or 'Unknown error'}\n")
 
-        # Conversion Details Section
-        content.append("\n## Conversion Details\n\n")
-        content.append("### About This Conversion\n\n")
+        # Skipped Files Section
+        if skipped_files:
+            w("\n## Skipped Files (Already Up to Date)\n")
+            w(f"{len(skipped_files)} files already had an up-to-date target from a previous run.\n\n")
 
-        format_descriptions = {
-            'mp3': "MP3 is the most widely supported audio format, compatible with virtually all devices and media players.",
-            'aac': "AAC offers better quality than MP3 at the same bitrate and is the standard for Apple devices and streaming services.",
-            'flac': "FLAC is a lossless format that provides perfect audio quality while reducing file size by about 40-50% compared to WAV.",
-            'opus': "Opus is a modern, highly efficient codec that provides excellent quality at very low bitrates."
-        }
+            for result in skipped_files:
+                w(f"- `{result.source_path.name}`\n")
 
-        content.append(f"{format_descriptions.get(codec.lower(), 'Unknown format.')}\n\n")
+        # Conversion Details Section
+        w("\n## Conversion Details\n\n")
+        w("### About This Conversion\n\n")
+
+        w(f"{_FORMAT_DESCRIPTIONS.get(codec.lower(), 'Unknown format.')}\n\n")
 
         if codec.lower() == 'flac':
-            content.append("Since you selected FLAC (lossless), all conversions preserve the original audio quality exactly.\n\n")
+            w("Since you selected FLAC (lossless), all conversions preserve the original audio quality exactly.\n\n")
         else:
-            content.append(f"The {bitrate}kbps bitrate provides a balance between audio quality and file size.\n\n")
-
-        content.append("---\n")
-        content.append("*Report generated by Music Converter CLI Tool*")
-
-        return "".join(content)
-
-    def _calculate_statistics(self, results: List[ConversionResult]) -> Dict[str, Any]:
-        """Calculate statistics from conversion results"""
+            w(f"The {bitrate}kbps bitrate provides a balance between audio quality and file size.\n\n")
+
+        w("---\n")
+        w("*Report generated by Music Converter CLI Tool*")
+
+    def _calculate_statistics(self, results: List[ConversionResult]
+                              ) -> Tuple[Dict[str, Any], Tuple[List[ConversionResult], ...]]:
+        """Calculate statistics from conversion results, plus the (converted, copied, error, skipped) partitions"""
+        converted_list, copied_list, error_list, skipped_list = [], [], [], []
+        original_size = final_size = 0
+        for r in results:
+            action = r.action
+            if action == Action.CONVERTED:
+                converted_list.append(r)
+            elif action == Action.COPIED:
+                copied_list.append(r)
+            elif action == Action.ERROR:
+                error_list.append(r)
+            elif action == Action.SKIPPED:
+                skipped_list.append(r)
+            original_size += r.source_size
+            final_size += r.target_size
         total = len(results)
-        converted = len([r for r in results if r.action == 'converted'])
-        copied = len([r for r in results if r.action == 'copied'])
-        errors = len([r for r in results if r.action == 'error'])
-
-        original_size = sum(r.source_size for r in results)
-        final_size = sum(r.target_size for r in results)
+        errors = len(error_list)
 
         space_saved = original_size - final_size
         space_saved_percent = (space_saved / original_size * 100) if original_size > 0 else 0
@@ -154,26 +190,26 @@ class ReportGenerator:
 
         return {
             'total': total,
-            'converted': converted,
-            'copied': copied,
+            'converted': len(converted_list),
+            'copied': len(copied_list),
             'errors': errors,
+            'skipped': len(skipped_list),
             'original_size': original_size,
             'final_size': final_size,
             'space_saved': space_saved,
             'space_saved_percent': space_saved_percent,
             'success_rate': success_rate
-        }
+        }, (converted_list, copied_list, error_list, skipped_list)
 
     def _format_size(self, size_bytes: int) -> str:
         """Format bytes as human-readable size"""
-        if size_bytes < 1024:
+        if size_bytes < _KB:
             return f"{size_bytes} B"
-        elif size_bytes < 1024 * 1024:
-            return f"{size_bytes / 1024:.1f} KB"
-        elif size_bytes < 1024 * 1024 * 1024:
-            return f"{size_bytes / (1024 * 1024):.1f} MB"
-        else:
-            return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
+        if size_bytes < _MB:
+            return f"{size_bytes / _KB:.1f} KB"
+        if size_bytes < _GB:
+            return f"{size_bytes / _MB:.1f} MB"
+        return f"{size_bytes / _GB:.1f} GB"
 
     def print_report_location(self, report_path: Path):
         """Print information about the report location"""
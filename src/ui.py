@@ -4,7 +4,7 @@ Interactive user interface for the music converter.
 Handles user prompts, progress bars, and terminal output using Rich.
 """
 
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from rich.console import Console
 from rich.prompt import Prompt, IntPrompt, Confirm
 from rich.progress import Progress, BarColumn, TextColumn, MofNCompleteColumn, TimeRemainingColumn, SpinnerColumn
@@ -12,20 +12,19 @@ from rich.table import Table
 from rich.panel import Panel
 from rich.text import Text
 from rich.live import Live
+from rich.spinner import Spinner
 from contextlib import contextmanager
+from functools import cached_property
+import os
 import sys
+import threading
 
 
-class MusicConverterUI:
-    """Interactive UI for music converter"""
+# CPU count is read once; the recommended thread count is half of it
+_CPU_COUNT = os.cpu_count() or 1
+_DEFAULT_THREADS = max(1, _CPU_COUNT // 2)
 
-    def __init__(self):
-        self.console = Console()
-        self.progress = None
-
-    def show_welcome(self):
-        """Display welcome message"""
-        welcome_text = """
+_WELCOME_TEXT = """
 🎵 [bold blue]Music Converter[/bold blue] 🎵
 
 Convert your music collection to different formats with metadata preservation.
@@ -36,124 +35,292 @@ Features:
 • [green]✓[/green] Smart conversion (skip if already in target format)
 • [green]✓[/green] Progress tracking
 • [green]✓[/green] Detailed reports
-        """
-        self.console.print(Panel(welcome_text.strip(), title="Welcome", border_style="blue"))
-
-    def get_codec_preferences(self) -> Tuple[str, int]:
-        """Get user preferences for codec and bitrate"""
-        self.console.print("\n[bold]Select Target Format:[/bold]")
-
-        # Create format selection table
-        format_table = Table(title="Available Formats", show_header=True)
-        format_table.add_column("Code", style="cyan", width=6)
-        format_table.add_column("Format", style="magenta")
-        format_table.add_column("Description", style="white")
-        format_table.add_column("Best For", style="green")
-
-        format_table.add_row("1", "MP3", "MPEG Audio Layer 3", "Maximum compatibility")
-        format_table.add_row("2", "AAC", "Advanced Audio Codec", "Apple devices, streaming")
-        format_table.add_row("3", "FLAC", "Free Lossless Audio Codec", "Archival, audiophiles")
-        format_table.add_row("4", "Opus", "Open, royalty-free codec", "Modern applications")
-
-        self.console.print(format_table)
-
-        # Get codec selection
-        codec_choices = {
-            "1": ("mp3", [128, 192, 256, 320]),
-            "2": ("aac", [128, 192, 256, 320]),
-            "3": ("flac", []),  # Lossless, no bitrate
-            "4": ("opus", [64, 96, 128, 192, 256])
-        }
-
-        while True:
-            choice = Prompt.ask(
-                "\n[bold]Select format (1-4)[/bold]",
-                choices=["1", "2", "3", "4"],
-                default="1"
-            )
-
-            target_codec, available_bitrates = codec_choices[choice]
-
-            # Show format info
-            format_info = self._get_format_info(target_codec)
-            self.console.print(Panel(format_info, title=f"Selected: {target_codec.upper()}", border_style="green"))
-
-            if not available_bitrates:
-                self.console.print(f"[green]✓[/green] {target_codec.upper()} is lossless - no bitrate needed")
-                return target_codec, 0
-
-            # Get bitrate selection
-            bitrate = self._get_bitrate_selection(target_codec, available_bitrates)
-
-            if Confirm.ask(f"\n[bold]Convert to {target_codec.upper()} at {bitrate} kbps?[/bold]", default=True):
-                return target_codec, bitrate
+"""
 
-    def _get_format_info(self, codec: str) -> str:
-        """Get detailed information about a format"""
-        format_info = {
-            "mp3": """
+_FORMAT_INFO_TEXT = {
+    "mp3": """
 MP3 (MPEG Audio Layer 3)
 • Most widely supported audio format
 • Good quality at reasonable file sizes
 • Compatible with virtually all devices
 • Recommended bitrate: 192-320 kbps
-            """,
-            "aac": """
+""",
+    "aac": """
 AAC (Advanced Audio Codec)
 • Better quality than MP3 at same bitrate
 • Standard for Apple devices and streaming
 • Good compression efficiency
 • Recommended bitrate: 256 kbps
-            """,
-            "flac": """
+""",
+    "flac": """
 FLAC (Free Lossless Audio Codec)
 • Perfect quality, no data loss
 • Half the size of original WAV
 • Full metadata support
 • Best for music archives and audiophiles
-            """,
-            "opus": """
+""",
+    "opus": """
 Opus
 • Modern, highly efficient codec
 • Excellent quality at low bitrates
 • Open and royalty-free
 • Recommended bitrate: 128-192 kbps
-            """
-        }
+"""
+}
+
+# Codecs that can be selected through MC_CODEC
+_CODECS = frozenset({"mp3", "aac", "flac", "opus"})
+
+# Format menu choice -> (codec, selectable bitrates)
+_CODEC_CHOICES = {
+    "1": ("mp3", [128, 192, 256, 320]),
+    "2": ("aac", [128, 192, 256, 320]),
+    "3": ("flac", []),  # Lossless, no bitrate
+    "4": ("opus", [64, 96, 128, 192, 256])
+}
+_CODEC_BITRATES = dict(_CODEC_CHOICES.values())
+
+# Bitrate option descriptions, keyed by (codec, bitrate) since the same
+# bitrate means different things for MP3/AAC and Opus
+_BITRATE_DESC = {
+    ("mp3", 128): "Good quality (small files)",
+    ("mp3", 192): "Better quality",
+    ("mp3", 256): "Excellent quality",
+    ("mp3", 320): "Maximum quality (larger files)",
+    ("aac", 128): "Good quality (small files)",
+    ("aac", 192): "Better quality",
+    ("aac", 256): "Excellent quality",
+    ("aac", 320): "Maximum quality (larger files)",
+    ("opus", 64): "Low bitrate (very small files)",
+    ("opus", 96): "Low quality",
+    ("opus", 128): "Good quality (Opus)",
+    ("opus", 192): "Excellent quality (Opus)",
+    ("opus", 256): "Maximum quality (Opus)"
+}
+
+# (unit, divisor) for each power of 1024, indexed by (bit_length - 1) // 10
+_UNITS = (("B", 1), ("KB", 1 << 10), ("MB", 1 << 20), ("GB", 1 << 30))
+
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer from the environment, falling back to default if unset or invalid"""
+    try:
+        return int(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def _human_size(size_bytes: int) -> str:
+    """Format bytes as human-readable size"""
+    if size_bytes <= 0:
+        return f"{size_bytes} B"
+
+    # Every 10 bits of magnitude is one unit step (B, KB, MB, GB)
+    idx = min((size_bytes.bit_length() - 1) // 10, 3)
+    if idx == 0:
+        return f"{size_bytes} B"
+    unit, divisor = _UNITS[idx]
+    return f"{size_bytes / divisor:.1f} {unit}"
+
+
+def _fmt_simple(filename: str, action: str, start: str, end: str, size_before: int, size_after: int) -> str:
+    """Status line that just names the action"""
+    return f"  • {filename} - {start}{action}{end}"
+
+
+def _fmt_convert(filename: str, action: str, start: str, end: str, size_before: int, size_after: int) -> str:
+    """Status line for a converted file, with its size change"""
+    return f"  • {filename} - {start}converted{end} ({_human_size(size_before)} → {_human_size(size_after)})"
+
+
+def _fmt_error(filename: str, action: str, start: str, end: str, size_before: int, size_after: int) -> str:
+    """Status line for a file that failed"""
+    return f"  • {filename} - {start}error{end}"
+
+
+# Lower-cased action -> status line builder for show_file_status; builders
+# get the opening/closing style as Rich markup or raw ANSI codes
+_ACTION_HANDLERS = {
+    "copied": _fmt_simple,
+    "skipped": _fmt_simple,
+    "converting": _fmt_convert,
+    "converted": _fmt_convert,
+    "error": _fmt_error
+}
+
+# Raw ANSI codes for the fixed styles used on hot output paths, written
+# directly to colour terminals instead of going through Rich's markup parser
+_ANSI_RESET = "\x1b[0m"
+_ANSI_CODES = {
+    "green": "\x1b[32m",
+    "red": "\x1b[31m",
+    "yellow": "\x1b[33m",
+    "blue": "\x1b[34m",
+    "white": "\x1b[37m",
+    "dim": "\x1b[2m",
+    "bold red": "\x1b[1;31m",
+    "bold yellow": "\x1b[1;33m",
+    "bold green": "\x1b[1;32m"
+}
+
+# Static panels are built once at import instead of on every prompt
+_WELCOME_PANEL = Panel(_WELCOME_TEXT.strip(), title="Welcome", border_style="blue")
+_FORMAT_INFO_PANELS = {
+    codec: Panel(text.strip(), title=f"Selected: {codec.upper()}", border_style="green")
+    for codec, text in _FORMAT_INFO_TEXT.items()
+}
+
+
+class _FastPrompt(Prompt):
+    """Prompt that validates the answer against a precomputed set of choices"""
+
+    def __init__(self, *args, choices: List[str], **kwargs):
+        super().__init__(*args, choices=list(choices), **kwargs)
+        self._choice_set = frozenset(choices)
+
+    def check_choice(self, value: str) -> bool:
+        """Check value is one of the valid choices"""
+        return value.strip() in self._choice_set
+
+
+# Menu prompts are built once and reused for every selection
+_CODEC_PROMPT = _FastPrompt("\n[bold]Select format (1-4)[/bold]", choices=sorted(_CODEC_CHOICES))
+_BITRATE_PROMPTS = {
+    count: _FastPrompt("[bold]Select bitrate[/bold]", choices=[str(i) for i in range(1, count + 1)])
+    for count in {len(bitrates) for _, bitrates in _CODEC_CHOICES.values() if bitrates}
+}
+
+
+class ProgressCounter:
+    """Thread-safe completion counter"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def increment(self, amount: int = 1):
+        """Record completed items"""
+        with self._lock:
+            self.value += amount
 
-        return format_info.get(codec, "Unknown format")
+
+class MusicConverterUI:
+    """Interactive UI for music converter"""
+
+    # Status colour per lower-cased action
+    _ACTION_COLORS = {
+        "converting": "yellow",
+        "converted": "yellow",
+        "copied": "green",
+        "skipped": "blue",
+        "error": "red"
+    }
+
+    def __init__(self):
+        self.console = Console()
+        self.progress = None
+        # Without a terminal on both ends prompts can't be answered, so defaults are used
+        self.interactive = sys.stdin.isatty() and sys.stdout.isatty()
+        # Per-file status lines are printed in batches instead of one by one
+        self._line_buffer: List[str] = []
+        self._buffer_threshold = 64
+        # Fixed-style output is written as raw ANSI on colour terminals
+        self._ansi = (self.console.is_terminal and not self.console.no_color
+                      and self.console.color_system in ("standard", "256", "truecolor"))
+        # Number of Live displays (progress bar, spinners) currently drawn
+        self._live_depth = 0
+        # Seconds between progress redraws on a terminal
+        self._refresh_interval = 0.1
+
+    def show_welcome(self):
+        """Display welcome message"""
+        self.console.print(_WELCOME_PANEL)
+
+    def get_codec_preferences(self) -> Tuple[str, int]:
+        """Get user preferences for codec and bitrate"""
+        if not self.interactive:
+            return self._default_codec_preferences()
+
+        self._print_batch("\n[bold]Select Target Format:[/bold]", self._format_table)
+
+        while True:
+            choice = _CODEC_PROMPT(default="1")
+
+            target_codec, available_bitrates = _CODEC_CHOICES[choice]
+
+            # Show format info
+            self.console.print(_FORMAT_INFO_PANELS[target_codec])
+
+            if not available_bitrates:
+                self.console.print(f"[green]✓[/green] {target_codec.upper()} is lossless - no bitrate needed")
+                return target_codec, 0
+
+            # Get bitrate selection
+            bitrate = self._get_bitrate_selection(target_codec, available_bitrates)
+
+            if Confirm.ask(f"\n[bold]Convert to {target_codec.upper()} at {bitrate} kbps?[/bold]", default=True):
+                return target_codec, bitrate
+
+    @cached_property
+    def _format_table(self) -> Table:
+        """Format selection table, built once and reused by every prompt"""
+        format_table = Table(title="Available Formats", show_header=True)
+        format_table.add_column("Code", style="cyan", width=6)
+        format_table.add_column("Format", style="magenta")
+        format_table.add_column("Description", style="white")
+        format_table.add_column("Best For", style="green")
+
+        format_table.add_row("1", "MP3", "MPEG Audio Layer 3", "Maximum compatibility")
+        format_table.add_row("2", "AAC", "Advanced Audio Codec", "Apple devices, streaming")
+        format_table.add_row("3", "FLAC", "Free Lossless Audio Codec", "Archival, audiophiles")
+        format_table.add_row("4", "Opus", "Open, royalty-free codec", "Modern applications")
+
+        return format_table
+
+    def _default_codec_preferences(self) -> Tuple[str, int]:
+        """Codec and bitrate from MC_CODEC/MC_BITRATE, defaulting to MP3 320kbps"""
+        target_codec = os.environ.get("MC_CODEC", "mp3").lower()
+        if target_codec not in _CODECS:
+            self.show_warning(f"Ignoring unknown MC_CODEC '{target_codec}', using MP3")
+            target_codec = "mp3"
+
+        available_bitrates = _CODEC_BITRATES[target_codec]
+        if not available_bitrates:
+            return target_codec, 0  # Lossless, no bitrate
+
+        # Highest bitrate the menu offers: 320kbps for MP3/AAC, 256kbps for Opus
+        default_bitrate = available_bitrates[-1]
+        value = os.environ.get("MC_BITRATE")
+        if value is None:
+            return target_codec, default_bitrate
+        try:
+            bitrate = int(value)
+        except ValueError:
+            bitrate = None
+        if bitrate not in available_bitrates:
+            self.show_warning(f"Ignoring unsupported MC_BITRATE '{value}' for {target_codec.upper()}, "
+                              f"using {default_bitrate} kbps")
+            return target_codec, default_bitrate
+        return target_codec, bitrate
 
     def _get_bitrate_selection(self, codec: str, available_bitrates: List[int]) -> int:
         """Get bitrate selection from user"""
         self.console.print(f"\n[bold]Select Bitrate for {codec.upper()}:[/bold]")
 
-        # Create bitrate options
-        bitrate_descriptions = {
-            128: "Good quality (small files)",
-            192: "Better quality",
-            256: "Excellent quality",
-            320: "Maximum quality (larger files)",
-            64: "Low bitrate (very small files)",
-            96: "Low quality",
-            128: "Good quality (Opus)",
-            192: "Excellent quality (Opus)",
-            256: "Maximum quality (Opus)"
-        }
-
         bitrate_table = Table(show_header=False)
         bitrate_table.add_column("Option", style="cyan", width=4)
         bitrate_table.add_column("Bitrate", style="magenta")
         bitrate_table.add_column("Description", style="white")
 
         for i, bitrate in enumerate(available_bitrates, 1):
-            description = bitrate_descriptions.get(bitrate, f"{bitrate} kbps")
+            description = _BITRATE_DESC.get((codec, bitrate), f"{bitrate} kbps")
             bitrate_table.add_row(str(i), f"{bitrate} kbps", description)
 
         self.console.print(bitrate_table)
 
         # Get user choice
-        choices = [str(i) for i in range(1, len(available_bitrates) + 1)]
-        choice = Prompt.ask("[bold]Select bitrate[/bold]", choices=choices, default="2")
+        choice = _BITRATE_PROMPTS[len(available_bitrates)](default="2")
         return available_bitrates[int(choice) - 1]
 
     def show_conversion_preview(self, source_dir: str, target_dir: str, total_files: int,
@@ -173,6 +340,9 @@ Opus
 
         self.console.print(preview_table)
 
+        if not self.interactive:
+            return
+
         if not Confirm.ask("\n[bold]Start conversion?[/bold]", default=True):
             self.console.print("[yellow]Conversion cancelled.[/yellow]")
             sys.exit(0)
@@ -180,44 +350,122 @@ Opus
     @contextmanager
     def create_progress_bar(self, total_files: int):
         """Create and manage progress bar context"""
+        if self.console.is_terminal:
+            columns = (
+                SpinnerColumn(),
+                TextColumn("[bold blue]{task.description}"),
+                BarColumn(bar_width=None),
+                MofNCompleteColumn(),
+                TimeRemainingColumn(),
+                TextColumn("[progress.percentage]{task.percentage:>3.0f}%")
+            )
+        else:
+            # Redirected output gets no animated columns, just the count
+            columns = (TextColumn("{task.description}"), MofNCompleteColumn())
+
         with Progress(
-            SpinnerColumn(),
-            TextColumn("[bold blue]{task.description}"),
-            BarColumn(bar_width=None),
-            MofNCompleteColumn(),
-            TimeRemainingColumn(),
-            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-            console=self.console
+            *columns,
+            console=self.console,
+            transient=False,
+            expand=False,
+            auto_refresh=False  # Redraws are driven by coalesced_progress
         ) as progress:
             task = progress.add_task("[cyan]Processing music files...", total=total_files)
-            yield progress, task
+            with self._tracking_live():
+                try:
+                    yield progress, task
+                finally:
+                    self._flush()
 
-    def update_progress(self, progress, task_id: int, description: str, advance: int = 1):
-        """Update progress bar"""
-        progress.update(task_id, description=description, advance=advance)
+    @contextmanager
+    def _tracking_live(self):
+        """Mark a Live display as drawn so output is routed through Rich meanwhile"""
+        self._live_depth += 1
+        try:
+            yield
+        finally:
+            self._live_depth -= 1
+
+    @property
+    def _live_active(self) -> bool:
+        return self._live_depth > 0
+
+    @contextmanager
+    def coalesced_progress(self, progress, task_id: int, total: int, interval: Optional[float] = None):
+        """Yield a ProgressCounter whose value is pushed to the progress bar at most every interval seconds"""
+        if interval is None:
+            interval = self._refresh_interval
+        counter = ProgressCounter()
+        stop = threading.Event()
+
+        def refresh():
+            completed = counter.value
+            progress.update(task_id, completed=completed, description=f"Processing ({completed}/{total})",
+                            refresh=True)
+
+        def poll():
+            while not stop.wait(interval):
+                refresh()
+
+        # Redirected output only shows the final state, so don't poll at all
+        poller = None
+        if self.console.is_terminal:
+            poller = threading.Thread(target=poll, daemon=True)
+            poller.start()
+        try:
+            yield counter
+        finally:
+            if poller is not None:
+                stop.set()
+                poller.join()
+            refresh()
 
     def show_file_status(self, filename: str, action: str, size_before: int = 0, size_after: int = 0):
         """Show status for individual file processing"""
-        action_colors = {
-            "converting": "yellow",
-            "copied": "green",
-            "skipped": "blue",
-            "error": "red"
-        }
-
-        color = action_colors.get(action.lower(), "white")
-
-        if action.lower() in ["copied", "skipped"]:
-            self.console.print(f"  • {filename} - [{color}]{action}[/{color}]")
-        elif action.lower() == "converting":
-            size_change = f" ({self._format_size(size_before)} → {self._format_size(size_after)})"
-            self.console.print(f"  • {filename} - [{color}]converted[/{color}]{size_change}")
-        elif action.lower() == "error":
-            self.console.print(f"  • {filename} - [{color}]error[/{color}]")
+        action_l = action.lower()
+        handler = _ACTION_HANDLERS.get(action_l)
+        if handler is not None:
+            color = self._ACTION_COLORS.get(action_l, "white")
+            if self._ansi:
+                start, end = _ANSI_CODES[color], _ANSI_RESET
+            else:
+                start, end = f"[{color}]", f"[/{color}]"
+            self._line_buffer.append(handler(filename, action, start, end, size_before, size_after))
+
+        if len(self._line_buffer) >= self._buffer_threshold:
+            self._flush()
+
+    def _flush(self):
+        """Print buffered status lines in a single console write"""
+        if self._line_buffer:
+            lines = "\n".join(self._line_buffer)
+            if not self._ansi:
+                self.console.print(lines)
+            elif self._live_active:
+                # Let Rich place the lines above the progress bar
+                self.console.print(Text.from_ansi(lines))
+            else:
+                self._fast_print(lines)
+            self._line_buffer.clear()
+
+    def _fast_print(self, line: str):
+        """Write an already styled line straight to the terminal"""
+        file = self.console.file
+        file.write(line + "\n")
+        file.flush()
+
+    def _print_message(self, style: str, label: str, message: str):
+        """Print a styled label followed by a message, bypassing Rich when safe"""
+        # Messages that may carry markup, or any output while a live display
+        # is drawn, still go through Rich
+        if self._ansi and not self._live_active and "[" not in label and "[" not in message:
+            self._fast_print(f"{_ANSI_CODES[style]}{label}{_ANSI_RESET}{message}")
+        else:
+            self.console.print(f"[{style}]{label}[/{style}]{message}")
 
     def show_conversion_summary(self, stats: Dict[str, Any], codec: str, bitrate: int):
         """Display final conversion summary"""
-        self.console.print("\n[bold green]🎉 Conversion Complete! 🎉[/bold green]\n")
+        self._flush()
 
         # Create summary table
         summary_table = Table(title="Conversion Summary", show_header=True)
@@ -228,6 +476,7 @@ Opus
         summary_table.add_row("Files Converted", f"[green]{stats.get('converted', 0)}[/green]")
         summary_table.add_row("Files Copied", f"[blue]{stats.get('copied', 0)}[/blue]")
         summary_table.add_row("Errors", f"[red]{stats.get('errors', 0)}[/red]")
+        summary_table.add_row("Skipped (up to date)", f"[dim]{stats.get('skipped', 0)}[/dim]")
         summary_table.add_row("", "")  # Separator
         summary_table.add_row("Original Size", self._format_size(stats.get('total_source_size', 0)))
         summary_table.add_row("Final Size", self._format_size(stats.get('total_target_size', 0)))
@@ -241,62 +490,75 @@ Opus
 
         summary_table.add_row("Space Saved", f"[{space_saved_color}]{space_saved_text}[/{space_saved_color}]")
 
-        self.console.print(summary_table)
-
         # Show target format info
         format_text = f"Target Format: {codec.upper()} @ {bitrate} kbps" if bitrate > 0 else f"Target Format: {codec.upper()} (Lossless)"
-        self.console.print(f"\n[dim]{format_text}[/dim]")
+
+        self._print_batch(
+            "\n[bold green]🎉 Conversion Complete! 🎉[/bold green]\n",
+            summary_table,
+            f"\n[dim]{format_text}[/dim]"
+        )
+
+    def _print_batch(self, *renderables):
+        """Render several items and write them to the terminal in one go"""
+        with self.console.capture() as capture:
+            for renderable in renderables:
+                self.console.print(renderable)
+        self.console.file.write(capture.get())
+        self.console.file.flush()
 
     def _format_size(self, size_bytes: int) -> str:
         """Format bytes as human-readable size"""
-        if size_bytes < 1024:
-            return f"{size_bytes} B"
-        elif size_bytes < 1024 * 1024:
-            return f"{size_bytes / 1024:.1f} KB"
-        elif size_bytes < 1024 * 1024 * 1024:
-            return f"{size_bytes / (1024 * 1024):.1f} MB"
-        else:
-            return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
+        return _human_size(size_bytes)
 
     def show_error(self, message: str):
         """Display error message"""
-        self.console.print(f"[bold red]Error:[/bold red] {message}")
+        self._flush()  # Keep messages in order with buffered status lines
+        self._print_message("bold red", "Error:", f" {message}")
 
     def show_warning(self, message: str):
         """Display warning message"""
-        self.console.print(f"[bold yellow]Warning:[/bold yellow] {message}")
+        self._flush()
+        self._print_message("bold yellow", "Warning:", f" {message}")
 
     def show_info(self, message: str):
         """Display info message"""
-        self.console.print(f"[dim]{message}[/dim]")
+        self._flush()
+        self._print_message("dim", message, "")
 
     def show_success(self, message: str):
         """Display success message"""
-        self.console.print(f"[bold green]✓[/bold green] {message}")
+        self._flush()
+        self._print_message("bold green", "✓", f" {message}")
 
+    @contextmanager
     def create_loading_spinner(self, description: str = "Processing..."):
         """Create loading spinner for long operations"""
-        from rich.live import Live
-        from rich.spinner import Spinner
-
         spinner = Spinner("dots", text=description)
-        return Live(spinner, console=self.console, transient=True)
+        with Live(spinner, console=self.console, transient=True) as live, self._tracking_live():
+            yield live
 
     def ask_confirmation(self, question: str, default: bool = False) -> bool:
         """Ask user a yes/no question"""
+        if not self.interactive:
+            return default
         return Confirm.ask(question, default=default)
 
     def prompt_for_input(self, question: str, default: str = "", choices: List[str] = None) -> str:
         """Prompt user for input"""
+        if not self.interactive:
+            return default
         return Prompt.ask(question, default=default, choices=choices)
 
     def get_thread_count(self) -> int:
         """Get number of threads for parallel processing"""
-        import os
-        default_threads = max(1, (os.cpu_count() or 1) // 2)
+        if not self.interactive:
+            return max(1, _env_int("MC_THREADS", _DEFAULT_THREADS))
+
+        default_threads = _DEFAULT_THREADS
 
         self.console.print(f"\n[bold]Parallel Processing Settings:[/bold]")
-        self.console.print(f"[dim]Your system has {os.cpu_count() or 1} CPU cores.[/dim]")
+        self.console.print(f"[dim]Your system has {_CPU_COUNT} CPU cores.[/dim]")
         self.console.print(f"[dim]Recommended: {default_threads} threads (half of CPU cores)[/dim]")
 
         while True:
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Tests for the conversion decision logic and target bookkeeping in src.converter.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.converter import MusicConverter, AudioInfo, Action
+
+
+# Source extension -> codec ffprobe reports for it
+_EXTENSION_CODECS = {
+    '.mp3': 'mp3',
+    '.m4a': 'aac',
+    '.flac': 'flac',
+    '.ogg': 'vorbis',
+    '.wav': 'pcm_s16le',
+    '.wma': 'wmav2'
+}
+
+# Bitrates (bps) a probe may report; None is what VBR files often give
+_SOURCE_BITRATES = (None, 96000, 128000, 192000, 256000, 320000)
+
+# Target codec -> bitrates (kbps) the UI offers
+_TARGETS = {
+    'mp3': (128, 192, 256, 320),
+    'aac': (128, 192, 256, 320),
+    'flac': (0,),
+    'opus': (64, 96, 128, 192, 256)
+}
+
+
+class NeedsConversionTest(unittest.TestCase):
+    """quick_needs_conversion must agree with needs_conversion whenever it decides"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.converter = MusicConverter(Path(tmp.name) / 'music', Path(tmp.name) / 'music-converted')
+
+    def test_quick_decision_matches_probe_decision(self):
+        decided = 0
+        for ext, source_codec in _EXTENSION_CODECS.items():
+            for target_codec, bitrates in _TARGETS.items():
+                for target_bitrate in bitrates:
+                    quick = self.converter.quick_needs_conversion(Path(f'song{ext}'), target_codec, target_bitrate)
+                    if quick is None:
+                        continue
+                    decided += 1
+                    for source_bitrate in _SOURCE_BITRATES:
+                        info = AudioInfo(codec=source_codec, bitrate=source_bitrate,
+                                         sample_rate=44100, duration=180.0, channels=2)
+                        with self.subTest(ext=ext, target=target_codec, bitrate=target_bitrate,
+                                          source_bitrate=source_bitrate):
+                            self.assertEqual(
+                                quick,
+                                self.converter.needs_conversion(info, target_codec, target_bitrate)
+                            )
+        self.assertGreater(decided, 0)
+
+    def test_quick_decision_is_case_insensitive(self):
+        self.assertTrue(self.converter.quick_needs_conversion(Path('song.FLAC'), 'MP3', 320))
+        self.assertFalse(self.converter.quick_needs_conversion(Path('song.MP3'), 'MP3', 320))
+
+    def test_undecidable_files_are_probed(self):
+        # Same codec below the maximum bitrate depends on the source bitrate
+        self.assertIsNone(self.converter.quick_needs_conversion(Path('song.mp3'), 'mp3', 192))
+        self.assertIsNone(self.converter.quick_needs_conversion(Path('song.m4a'), 'aac', 256))
+        self.assertIsNone(self.converter.quick_needs_conversion(Path('song.flac'), 'flac', 0))
+
+
+class BuildCommandTest(unittest.TestCase):
+    """Every ffmpeg output maps exactly one audio stream, plus cover art where the container allows"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.converter = MusicConverter(Path(tmp.name) / 'music', Path(tmp.name) / 'music-converted')
+
+    def command(self, codec):
+        return self.converter.build_ffmpeg_command(Path('in.wma'), Path('out'), codec, _TARGETS[codec][0])
+
+    def maps(self, codec):
+        cmd = self.command(codec)
+        return [cmd[i + 1] for i, arg in enumerate(cmd) if arg == '-map']
+
+    def test_single_audio_stream_is_mapped(self):
+        for codec in _TARGETS:
+            with self.subTest(codec=codec):
+                self.assertEqual(self.maps(codec)[0], '0:a:0')
+                self.assertEqual(self.maps(codec).count('0:a:0'), 1)
+
+    def test_cover_art_is_mapped_except_for_opus(self):
+        for codec in _TARGETS:
+            with self.subTest(codec=codec):
+                cmd = self.command(codec)
+                if codec == 'opus':
+                    self.assertEqual(self.maps(codec), ['0:a:0'])
+                    self.assertNotIn('-c:v', cmd)
+                else:
+                    self.assertEqual(self.maps(codec), ['0:a:0', '0:v?'])
+                    self.assertEqual(cmd[cmd.index('-c:v') + 1], 'copy')
+                    self.assertEqual(cmd[cmd.index('-disposition:v') + 1], 'attached_pic')
+
+
+class _ScriptedConverter(MusicConverter):
+    """Runs a small Python script in place of ffmpeg that writes its output and stderr, then exits with exit_code"""
+
+    exit_code = 0
+    stderr = ''
+
+    def build_ffmpeg_command(self, input_path, output_path, target_codec, target_bitrate):
+        script = ("import sys; open(sys.argv[1], 'w').write('encoded'); "
+                  "sys.stderr.write(sys.argv[3]); sys.exit(int(sys.argv[2]))")
+        return [sys.executable, '-c', script, str(output_path), str(self.exit_code), self.stderr]
+
+
+class TargetIsCurrentTest(unittest.TestCase):
+    """target_is_current only trusts complete targets made from the same source with the same settings"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.source_dir = Path(tmp.name) / 'music'
+        self.target_dir = Path(tmp.name) / 'music-converted'
+        self.source_dir.mkdir()
+        self.target_dir.mkdir()
+        self.source = self.source_dir / 'song.flac'
+        self.source.write_bytes(b'fLaC' + b'\0' * 64)
+        self.converter = _ScriptedConverter(self.source_dir, self.target_dir)
+
+    def process(self, source, codec='mp3', bitrate=320):
+        result = self.converter.process_file(source, codec, bitrate)
+        # main() records finished targets once metadata has been applied
+        if result.action in (Action.CONVERTED, Action.COPIED):
+            self.converter.record_target(source, codec, bitrate)
+        return result
+
+    def convert(self, codec='mp3', bitrate=320):
+        return self.process(self.source, codec, bitrate)
+
+    def test_missing_target_is_not_current(self):
+        self.assertFalse(self.converter.target_is_current(self.source, 'mp3', 320))
+
+    def test_unrecorded_target_is_not_current(self):
+        # A file left at the target path by something else says nothing about its settings
+        self.converter.get_output_path(self.source, 'mp3').write_bytes(b'encoded')
+        self.assertFalse(self.converter.target_is_current(self.source, 'mp3', 320))
+
+    def test_converted_target_is_current(self):
+        result = self.convert()
+        self.assertEqual(result.action, Action.CONVERTED)
+        self.assertTrue(self.converter.target_is_current(self.source, 'mp3', 320))
+        self.assertTrue(self.converter.target_is_current(self.source, 'MP3', 320))
+
+    def test_unrecorded_conversion_is_not_current(self):
+        # e.g. metadata could not be applied, or a --dry-run
+        result = self.converter.process_file(self.source, 'mp3', 320)
+        self.assertEqual(result.action, Action.CONVERTED)
+        self.assertFalse(self.converter.target_is_current(self.source, 'mp3', 320))
+
+    def test_rewritten_target_forgets_previous_record(self):
+        self.convert(bitrate=320)
+        self.converter.process_file(self.source, 'mp3', 192)
+        self.assertFalse(self.converter.target_is_current(self.source, 'mp3', 320))
+        self.assertFalse(self.converter.target_is_current(self.source, 'mp3', 192))
+
+    def test_changed_settings_are_not_current(self):
+        self.convert()
+        self.assertFalse(self.converter.target_is_current(self.source, 'mp3', 192))
+        self.assertFalse(self.converter.target_is_current(self.source, 'aac', 320))
+
+    def test_changed_source_is_not_current(self):
+        self.convert()
+        self.source.write_bytes(b'fLaC' + b'\1' * 128)
+        self.assertFalse(self.converter.target_is_current(self.source, 'mp3', 320))
+
+    def test_target_older_than_source_is_not_current(self):
+        self.convert()
+        output_path = self.converter.get_output_path(self.source, 'mp3')
+        source_mtime_ns = self.source.stat().st_mtime_ns
+        os.utime(output_path, ns=(source_mtime_ns - 10**9, source_mtime_ns - 10**9))
+        self.assertFalse(self.converter.target_is_current(self.source, 'mp3', 320))
+
+    def test_record_survives_probe_cache_reload(self):
+        self.convert()
+        self.assertIsNone(self.converter.save_probe_cache())
+        reloaded = MusicConverter(self.source_dir, self.target_dir)
+        self.assertTrue(reloaded.target_is_current(self.source, 'mp3', 320))
+        self.assertFalse(reloaded.target_is_current(self.source, 'mp3', 256))
+
+    def test_extension_decided_files_are_probed_for_the_report(self):
+        # The fake source is not real audio, so stand in for ffprobe/PyAV
+        info = AudioInfo(codec='flac', bitrate=891000, sample_rate=44100, duration=180.0, channels=2)
+        calls = []
+
+        async def fake_probe(file_path):
+            calls.append(file_path)
+            return info
+        self.converter.get_audio_info_async = fake_probe
+
+        result = self.convert()
+        self.assertEqual(result.action, Action.CONVERTED)
+        self.assertEqual(calls, [self.source])
+        self.assertEqual(result.source_format['bitrate'], 891000)
+
+    def test_unprobeable_source_still_converts(self):
+        async def failing_probe(file_path):
+            raise ValueError("Failed to analyze audio file")
+        self.converter.get_audio_info_async = failing_probe
+
+        result = self.convert()
+        self.assertEqual(result.action, Action.CONVERTED)
+        self.assertEqual(result.source_format, {'codec': 'flac'})
+
+    def test_prune_drops_missing_sources(self):
+        other = self.source_dir / 'other.flac'
+        other.write_bytes(b'fLaC')
+        self.convert()
+        self.process(other)
+
+        self.converter.prune_probe_cache([self.source])
+        self.assertIsNone(self.converter.save_probe_cache())
+
+        reloaded = MusicConverter(self.source_dir, self.target_dir)
+        self.assertEqual(list(reloaded._probe_cache), [str(self.source)])
+        self.assertTrue(reloaded.target_is_current(self.source, 'mp3', 320))
+
+    def test_failed_conversion_leaves_no_target(self):
+        self.converter.exit_code = 1
+        result = self.convert()
+        self.assertEqual(result.action, Action.ERROR)
+        self.assertEqual(list(self.target_dir.iterdir()), [])
+        self.assertFalse(self.converter.target_is_current(self.source, 'mp3', 320))
+
+    def test_failed_conversion_reports_error_lines_without_trailer(self):
+        self.converter.exit_code = 1
+        self.converter.stderr = (
+            "[libmp3lame @ 0x55d0c0] Error while opening encoder for output stream #0:0\n"
+            "Error initializing output stream 0:0 -- Invalid argument\n"
+            "Conversion failed!\n"
+        )
+        result = self.convert()
+        self.assertEqual(result.action, Action.ERROR)
+        self.assertEqual(
+            result.error_message,
+            "Conversion failed: [libmp3lame @ 0x55d0c0] Error while opening encoder for output stream #0:0; "
+            "Error initializing output stream 0:0 -- Invalid argument"
+        )
+
+    def test_failed_reconversion_keeps_previous_record_stale(self):
+        self.convert(bitrate=320)
+        self.converter.exit_code = 1
+        self.convert(bitrate=192)
+        # The 320kbps target is untouched, and a 192kbps run is still needed
+        self.assertEqual(self.converter.get_output_path(self.source, 'mp3').read_text(), 'encoded')
+        self.assertTrue(self.converter.target_is_current(self.source, 'mp3', 320))
+        self.assertFalse(self.converter.target_is_current(self.source, 'mp3', 192))
+
+    def test_copied_target_is_current(self):
+        source = self.source_dir / 'song.mp3'
+        source.write_bytes(b'ID3' + b'\0' * 64)
+        # An MP3 at the maximum bitrate is copied without probing
+        result = self.process(source, 'mp3', 320)
+        self.assertEqual(result.action, Action.COPIED)
+        self.assertTrue(self.converter.target_is_current(source, 'mp3', 320))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tests for tag key handling and extraction caching in src.metadata.
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+try:
+    from mutagen.flac import VCFLACDict
+    from src import metadata
+    from src.metadata import MetadataHandler
+except ImportError:
+    raise unittest.SkipTest("mutagen is not installed")
+
+
+class LowercaseTagKeysTest(unittest.TestCase):
+    """_lowercase_tag_keys maps lower-cased keys to keys the tags can be indexed with"""
+
+    def setUp(self):
+        self.handler = MetadataHandler()
+
+    def test_vorbis_comments(self):
+        tags = VCFLACDict()
+        tags['TITLE'] = 'Song'
+        tags['Artist'] = ['First', 'Second']
+        tags['album'] = 'Album'
+
+        lower_map = self.handler._lowercase_tag_keys(tags)
+
+        self.assertEqual(sorted(lower_map), ['album', 'artist', 'title'])
+        self.assertEqual(tags[lower_map['title']], ['Song'])
+        self.assertEqual(tags[lower_map['artist']], ['First', 'Second'])
+
+    def test_mixed_case_mapping_keeps_stored_key(self):
+        tags = {'TITLE': 'Song', 'AlbumArtist': 'Band'}
+
+        lower_map = self.handler._lowercase_tag_keys(tags)
+
+        self.assertEqual(lower_map, {'title': 'TITLE', 'albumartist': 'AlbumArtist'})
+
+    def test_non_string_keys_are_stringified(self):
+        tags = {('DATE', 0): '2020'}
+
+        lower_map = self.handler._lowercase_tag_keys(tags)
+
+        self.assertEqual(lower_map, {"('date', 0)": ('DATE', 0)})
+
+    def test_empty_tags(self):
+        self.assertEqual(self.handler._lowercase_tag_keys(VCFLACDict()), {})
+
+
+class MetadataCacheTest(unittest.TestCase):
+    """extract_metadata reuses results until a file's mtime or size changes"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.song = self.dir / 'song.mp3'
+        self.song.write_bytes(b'ID3' + b'\0' * 64)
+
+        self.handler = MetadataHandler()
+        self.calls = []
+        self.handler._extractors['.mp3'] = self._fake_extract
+
+    def _fake_extract(self, file_path):
+        self.calls.append(file_path)
+        return {'title': f'read {len(self.calls)}'}
+
+    def test_unchanged_file_is_read_once(self):
+        first = self.handler.extract_metadata(self.song)
+        second = self.handler.extract_metadata(self.song)
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(first, second)
+
+    def test_callers_get_copies(self):
+        self.handler.extract_metadata(self.song)['title'] = 'changed'
+        self.assertEqual(self.handler.extract_metadata(self.song), {'title': 'read 1'})
+
+    def test_mtime_change_invalidates(self):
+        self.handler.extract_metadata(self.song)
+        st = self.song.stat()
+        os.utime(self.song, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+        self.assertEqual(self.handler.extract_metadata(self.song), {'title': 'read 2'})
+
+    def test_size_change_invalidates(self):
+        self.handler.extract_metadata(self.song)
+        st = self.song.stat()
+        # Same mtime, different size, as a tool that preserves timestamps would leave it
+        self.song.write_bytes(b'ID3' + b'\0' * 128)
+        os.utime(self.song, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        self.assertEqual(self.handler.extract_metadata(self.song), {'title': 'read 2'})
+
+    def test_clear_cache(self):
+        self.handler.extract_metadata(self.song)
+        self.handler.clear_cache()
+        self.handler.extract_metadata(self.song)
+
+        self.assertEqual(len(self.calls), 2)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        other = self.dir / 'other.mp3'
+        third = self.dir / 'third.mp3'
+        other.write_bytes(b'ID3')
+        third.write_bytes(b'ID3')
+
+        with mock.patch.object(metadata, 'METADATA_CACHE_SIZE', 2):
+            self.handler.extract_metadata(self.song)
+            self.handler.extract_metadata(other)
+            self.handler.extract_metadata(self.song)   # song is now the most recent
+            self.handler.extract_metadata(third)       # evicts other
+            self.handler.extract_metadata(self.song)
+            self.handler.extract_metadata(other)
+
+        self.assertEqual(self.calls, [self.song, other, third, other])
+
+    def test_failed_extraction_is_not_cached(self):
+        def failing_extract(file_path):
+            self.calls.append(file_path)
+            raise ValueError("unreadable")
+        self.handler._extractors['.mp3'] = failing_extract
+
+        with self.assertLogs(metadata.logger, 'ERROR'):
+            self.assertEqual(self.handler.extract_metadata(self.song), {})
+            self.assertEqual(self.handler.extract_metadata(self.song), {})
+        self.assertEqual(len(self.calls), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
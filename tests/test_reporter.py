@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for size formatting and source format descriptions in src.reporter.
+"""
+
+import io
+import unittest
+from pathlib import Path
+
+from src.converter import ConversionResult, Action
+from src.reporter import ReportGenerator
+
+
+class ReportFormatSizeTest(unittest.TestCase):
+    """_format_size switches unit at each power of 1024"""
+
+    def setUp(self):
+        self.reporter = ReportGenerator()
+
+    def test_thresholds(self):
+        cases = [
+            (0, "0 B"),
+            (1023, "1023 B"),
+            (1024, "1.0 KB"),
+            (1536, "1.5 KB"),
+            ((1 << 20) - 1, "1024.0 KB"),
+            (1 << 20, "1.0 MB"),
+            ((1 << 30) - 1, "1024.0 MB"),
+            (1 << 30, "1.0 GB"),
+            (1 << 40, "1024.0 GB"),
+        ]
+        for size, expected in cases:
+            with self.subTest(size=size):
+                self.assertEqual(self.reporter._format_size(size), expected)
+
+
+def _result(name: str, action: Action, source_format: dict) -> ConversionResult:
+    return ConversionResult(
+        source_path=Path('music') / name,
+        target_path=Path('music-converted') / name,
+        action=action,
+        source_size=4 << 20,
+        target_size=2 << 20,
+        source_format=source_format
+    )
+
+
+class ReportSourceFormatTest(unittest.TestCase):
+    """The report describes the source bitrate, or why it is unknown"""
+
+    def report(self, *results):
+        f = io.StringIO()
+        ReportGenerator()._write_report_content(f, list(results), 'music', 'music-converted', 'mp3', 320)
+        return f.getvalue()
+
+    def test_probed_bitrate(self):
+        report = self.report(
+            _result('a.flac', Action.CONVERTED, {'codec': 'flac', 'bitrate': 891000}),
+            _result('b.mp3', Action.COPIED, {'codec': 'mp3', 'bitrate': 320000}),
+        )
+        self.assertIn("| a.flac | flac @ 891kbps | MP3 @ 320kbps |", report)
+        self.assertIn("- `b.mp3` - Already mp3 at 320kbps - No conversion needed\n", report)
+
+    def test_probed_without_bitrate_is_vbr(self):
+        report = self.report(
+            _result('a.flac', Action.CONVERTED, {'codec': 'flac', 'bitrate': None}),
+            _result('b.mp3', Action.COPIED, {'codec': 'mp3', 'bitrate': None}),
+        )
+        self.assertIn("| a.flac | flac (VBR) | MP3 @ 320kbps |", report)
+        self.assertIn("- `b.mp3` - Already mp3 (VBR) - No conversion needed\n", report)
+
+    def test_unprobed_source(self):
+        report = self.report(
+            _result('a.flac', Action.CONVERTED, {'codec': 'flac'}),
+            _result('b.mp3', Action.COPIED, {'codec': 'mp3'}),
+        )
+        self.assertIn("| a.flac | flac (not probed) | MP3 @ 320kbps |", report)
+        self.assertIn("- `b.mp3` - Already mp3 (not probed) - No conversion needed\n", report)
+
+
+if __name__ == '__main__':
+    unittest.main()
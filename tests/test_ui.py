@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for size formatting and file status lines in src.ui.
+"""
+
+import io
+import unittest
+
+try:
+    from rich.console import Console
+    from src import ui
+except ImportError:
+    raise unittest.SkipTest("rich is not installed")
+
+
+class HumanSizeTest(unittest.TestCase):
+    """_human_size switches unit at each power of 1024"""
+
+    def test_thresholds(self):
+        cases = [
+            (0, "0 B"),
+            (1, "1 B"),
+            (1023, "1023 B"),
+            (1024, "1.0 KB"),
+            (1536, "1.5 KB"),
+            ((1 << 20) - 1, "1024.0 KB"),
+            (1 << 20, "1.0 MB"),
+            ((1 << 30) - 1, "1024.0 MB"),
+            (1 << 30, "1.0 GB"),
+            (1 << 40, "1024.0 GB"),
+        ]
+        for size, expected in cases:
+            with self.subTest(size=size):
+                self.assertEqual(ui._human_size(size), expected)
+
+    def test_negative_sizes_stay_in_bytes(self):
+        self.assertEqual(ui._human_size(-2048), "-2048 B")
+
+    def test_ui_format_size_uses_human_size(self):
+        converter_ui = ui.MusicConverterUI()
+        self.assertEqual(converter_ui._format_size(5 * (1 << 20)), "5.0 MB")
+
+
+class FileStatusTest(unittest.TestCase):
+    """show_file_status prints one line per handled action"""
+
+    def setUp(self):
+        self.output = io.StringIO()
+        self.converter_ui = ui.MusicConverterUI()
+        self.converter_ui.console = Console(file=self.output, width=200, color_system=None)
+        self.converter_ui._ansi = False
+
+    def lines(self):
+        self.converter_ui._flush()
+        return self.output.getvalue().splitlines()
+
+    def test_converted_line_shows_size_change(self):
+        # main() reports finished conversions as "converted"
+        self.converter_ui.show_file_status("song.flac", "converted", 30 * (1 << 20), 10 * (1 << 20))
+        self.assertEqual(self.lines(), ["  • song.flac - converted (30.0 MB → 10.0 MB)"])
+
+    def test_converting_is_reported_as_converted(self):
+        self.converter_ui.show_file_status("song.flac", "Converting", 2048, 1024)
+        self.assertEqual(self.lines(), ["  • song.flac - converted (2.0 KB → 1.0 KB)"])
+
+    def test_simple_and_error_lines(self):
+        self.converter_ui.show_file_status("a.mp3", "copied")
+        self.converter_ui.show_file_status("b.mp3", "skipped")
+        self.converter_ui.show_file_status("c.wav", "error")
+        self.assertEqual(self.lines(), [
+            "  • a.mp3 - copied",
+            "  • b.mp3 - skipped",
+            "  • c.wav - error",
+        ])
+
+    def test_unknown_action_prints_nothing(self):
+        self.converter_ui.show_file_status("a.mp3", "queued")
+        self.assertEqual(self.lines(), [])
+
+    def test_converted_line_as_raw_ansi(self):
+        self.converter_ui._ansi = True
+        self.converter_ui.show_file_status("song.flac", "converted", 2048, 1024)
+        self.assertEqual(self.lines(), ["  • song.flac - \x1b[33mconverted\x1b[0m (2.0 KB → 1.0 KB)"])
+
+
+if __name__ == '__main__':
+    unittest.main()